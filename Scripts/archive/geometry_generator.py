@@ -13,17 +13,89 @@ Generates simple but accurate procedural geometry for:
 Output format matches IFC extraction database format:
 - vertices: BLOB of float32 triplets (X, Y, Z)
 - faces: BLOB of uint32 triplets (triangle indices)
-- normals: Optional BLOB of float32 triplets (per-vertex normals)
+- normals: Optional BLOB of float32 triplets (per-vertex normals),
+           or int8 triplets scaled by 127 when normals_dtype='int8'
 """
 
-import struct
 import hashlib
+from functools import lru_cache
 from typing import Tuple, List
 import math
 
+import numpy as np
+
+
+# Box corner sign pattern: vertex = center + sign * half_extents
+BOX_CORNER_SIGNS = np.array([
+    # Bottom face (Z = center_z - hz)
+    [-1, -1, -1],  # 0
+    [ 1, -1, -1],  # 1
+    [ 1,  1, -1],  # 2
+    [-1,  1, -1],  # 3
+    # Top face (Z = center_z + hz)
+    [-1, -1,  1],  # 4
+    [ 1, -1,  1],  # 5
+    [ 1,  1,  1],  # 6
+    [-1,  1,  1],  # 7
+], dtype=np.float64)
+
+# 12 triangular faces (6 quad faces × 2 triangles)
+# Each face is (v0, v1, v2) indices - counter-clockwise winding
+BOX_FACES = np.array([
+    # Bottom face (looking up, CCW)
+    [0, 2, 1], [0, 3, 2],
+    # Top face (looking down, CCW)
+    [4, 5, 6], [4, 6, 7],
+    # Front face (-Y, looking from +Y)
+    [0, 1, 5], [0, 5, 4],
+    # Back face (+Y, looking from -Y)
+    [3, 7, 6], [3, 6, 2],
+    # Left face (-X, looking from +X)
+    [0, 4, 7], [0, 7, 3],
+    # Right face (+X, looking from -X)
+    [1, 2, 6], [1, 6, 5],
+], dtype=np.uint32)
+
+# Normals (per-vertex, averaged from adjacent faces)
+# For a box, vertices are shared by 3 faces, so each normal is the normalized corner sign
+BOX_NORMALS = (BOX_CORNER_SIGNS / math.sqrt(3)).astype(np.float32)
+
+# Quantized normals: unit components mapped to int8 (-127..127)
+NORMAL_INT8_SCALE = 127
+
+# Pack to binary format (float32 for vertices/normals, uint32 for faces)
+BOX_FACES_BLOB = BOX_FACES.tobytes()
+BOX_NORMALS_BLOB = BOX_NORMALS.tobytes()
+
+
+def quantize_normals(normals: np.ndarray) -> bytes:
+    """Pack unit normals as int8 triplets (3 bytes/vertex instead of 12)."""
+    scaled = np.round(np.asarray(normals, dtype=np.float32) * NORMAL_INT8_SCALE)
+    return np.clip(scaled, -NORMAL_INT8_SCALE, NORMAL_INT8_SCALE).astype(np.int8).tobytes()
+
+
+def dequantize_normals(normals_blob: bytes) -> np.ndarray:
+    """Unpack int8 normals back to float32 (N, 3) unit vectors."""
+    quantized = np.frombuffer(normals_blob, dtype=np.int8).reshape(-1, 3)
+    return quantized.astype(np.float32) / NORMAL_INT8_SCALE
+
+
+BOX_NORMALS_INT8_BLOB = quantize_normals(BOX_NORMALS)
+NORMALS_BLOBS = {'float32': BOX_NORMALS_BLOB, 'int8': BOX_NORMALS_INT8_BLOB}
+
+
+@lru_cache(maxsize=4096)
+def _canonical_box_vertices(length: float, width: float, height: float) -> np.ndarray:
+    """Origin-centered box corners (float64), shared by all boxes of the same size."""
+    half_extents = np.array([length / 2.0, width / 2.0, height / 2.0])
+    vertices = BOX_CORNER_SIGNS * half_extents
+    vertices.setflags(write=False)  # Cached - callers must not mutate
+    return vertices
+
 
 def generate_box_geometry(length: float, width: float, height: float,
-                         center_x: float = 0.0, center_y: float = 0.0, center_z: float = 0.0) -> Tuple[bytes, bytes, bytes]:
+                         center_x: float = 0.0, center_y: float = 0.0, center_z: float = 0.0,
+                         normals_dtype: str = 'float32') -> Tuple[bytes, bytes, bytes]:
     """
     Generate box mesh geometry at specified world position.
 
@@ -34,68 +106,17 @@ def generate_box_geometry(length: float, width: float, height: float,
         center_x: World X position (meters)
         center_y: World Y position (meters)
         center_z: World Z position (meters)
+        normals_dtype: 'float32' (default) or 'int8' quantized normals
 
     Returns:
         (vertices_blob, faces_blob, normals_blob)
     """
-    # Half dimensions for offsetting from center
-    hx = length / 2.0
-    hy = width / 2.0
-    hz = height / 2.0
-
-    # 8 vertices of a box (offset from center position to world coordinates)
-    vertices = [
-        # Bottom face (Z = center_z - hz)
-        (center_x - hx, center_y - hy, center_z - hz),  # 0
-        (center_x + hx, center_y - hy, center_z - hz),  # 1
-        (center_x + hx, center_y + hy, center_z - hz),  # 2
-        (center_x - hx, center_y + hy, center_z - hz),  # 3
-        # Top face (Z = center_z + hz)
-        (center_x - hx, center_y - hy, center_z + hz),  # 4
-        (center_x + hx, center_y - hy, center_z + hz),  # 5
-        (center_x + hx, center_y + hy, center_z + hz),  # 6
-        (center_x - hx, center_y + hy, center_z + hz),  # 7
-    ]
-
-    # 12 triangular faces (6 quad faces × 2 triangles)
-    # Each face is (v0, v1, v2) indices - counter-clockwise winding
-    faces = [
-        # Bottom face (looking up, CCW)
-        (0, 2, 1), (0, 3, 2),
-        # Top face (looking down, CCW)
-        (4, 5, 6), (4, 6, 7),
-        # Front face (-Y, looking from +Y)
-        (0, 1, 5), (0, 5, 4),
-        # Back face (+Y, looking from -Y)
-        (3, 7, 6), (3, 6, 2),
-        # Left face (-X, looking from +X)
-        (0, 4, 7), (0, 7, 3),
-        # Right face (+X, looking from -X)
-        (1, 2, 6), (1, 6, 5),
-    ]
-
-    # Normals (per-vertex, averaged from adjacent faces)
-    # For a box, vertices are shared by 3 faces
-    normals = [
-        (-1, -1, -1),  # 0: left, front, bottom
-        ( 1, -1, -1),  # 1: right, front, bottom
-        ( 1,  1, -1),  # 2: right, back, bottom
-        (-1,  1, -1),  # 3: left, back, bottom
-        (-1, -1,  1),  # 4: left, front, top
-        ( 1, -1,  1),  # 5: right, front, top
-        ( 1,  1,  1),  # 6: right, back, top
-        (-1,  1,  1),  # 7: left, back, top
-    ]
-
-    # Normalize normals
-    normals = [normalize_vector(n) for n in normals]
-
-    # Pack to binary format (float32 for vertices/normals, uint32 for faces)
-    vertices_blob = struct.pack(f'{len(vertices) * 3}f', *[c for v in vertices for c in v])
-    faces_blob = struct.pack(f'{len(faces) * 3}I', *[i for f in faces for i in f])
-    normals_blob = struct.pack(f'{len(normals) * 3}f', *[c for n in normals for c in n])
-
-    return (vertices_blob, faces_blob, normals_blob)
+    # 8 vertices of a box (canonical box shifted to world coordinates)
+    center = np.array([center_x, center_y, center_z])
+    vertices = (_canonical_box_vertices(length, width, height) + center).astype(np.float32)
+
+    # Faces and normals are position-independent, packed once at import
+    return (vertices.tobytes(), BOX_FACES_BLOB, NORMALS_BLOBS[normals_dtype])
 
 
 def normalize_vector(v: Tuple[float, float, float]) -> Tuple[float, float, float]:
@@ -107,15 +128,31 @@ def normalize_vector(v: Tuple[float, float, float]) -> Tuple[float, float, float
 
 
 def generate_geometry_hash(vertices_blob: bytes, faces_blob: bytes) -> str:
-    """Generate SHA256 hash for geometry deduplication."""
-    hasher = hashlib.sha256()
+    """Generate BLAKE2b hash for geometry deduplication (256-bit, same hex width as SHA256)."""
+    hasher = hashlib.blake2b(digest_size=32)
     hasher.update(vertices_blob)
     hasher.update(faces_blob)
     return hasher.hexdigest()
 
 
+# Geometry generator per IFC class, registered at import time.
+# For now, all elements use box geometry
+# Future: Register specialized shapes (I-beams, circular columns, etc.) here
+# with the generate_box_geometry signature - the box path is unaffected.
+GEOMETRY_GENERATORS = {
+    'IfcWall': generate_box_geometry,
+    'IfcBeam': generate_box_geometry,
+    'IfcColumn': generate_box_geometry,
+    'IfcSlab': generate_box_geometry,
+    'IfcPlate': generate_box_geometry,
+    'IfcWindow': generate_box_geometry,
+    'IfcDoor': generate_box_geometry,
+}
+
+
 def generate_element_geometry(ifc_class: str, length: float, width: float, height: float,
-                             center_x: float = 0.0, center_y: float = 0.0, center_z: float = 0.0) -> Tuple[bytes, bytes, bytes, str]:
+                             center_x: float = 0.0, center_y: float = 0.0, center_z: float = 0.0,
+                             normals_dtype: str = 'float32') -> Tuple[bytes, bytes, bytes, str]:
     """
     Generate geometry for an element based on IFC class and dimensions.
 
@@ -127,15 +164,16 @@ def generate_element_geometry(ifc_class: str, length: float, width: float, heigh
         center_x: World X position (meters)
         center_y: World Y position (meters)
         center_z: World Z position (meters)
+        normals_dtype: 'float32' (default) or 'int8' quantized normals
 
     Returns:
         (vertices_blob, faces_blob, normals_blob, geometry_hash)
     """
-    # For now, all elements use box geometry
-    # Future: Can add specialized shapes (I-beams, circular columns, etc.)
+    # One dict lookup per element; unregistered classes fall back to a box
+    generator = GEOMETRY_GENERATORS.get(ifc_class, generate_box_geometry)
 
-    vertices_blob, faces_blob, normals_blob = generate_box_geometry(
-        length, width, height, center_x, center_y, center_z
+    vertices_blob, faces_blob, normals_blob = generator(
+        length, width, height, center_x, center_y, center_z, normals_dtype
     )
     geometry_hash = generate_geometry_hash(vertices_blob, faces_blob)
 
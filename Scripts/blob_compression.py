@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Geometry BLOB compression for the geometry library.
+
+base_geometries.compression records the codec used for each row:
+    NULL     - raw bytes (default; what federation-format readers expect)
+    'blosc2' - Blosc2 ZSTD with byte shuffle (pip install blosc2)
+    'zlib'   - stdlib fallback when blosc2 is not installed
+
+Hashes are always computed on the raw bytes, so compressed and raw rows
+of the same geometry share a geometry_hash.
+
+base_geometries.dtype records the element types of the mesh BLOBs:
+    NULL     - float32 vertices, int32 faces (default)
+    'f16i16' - float16 vertices, int16 faces (meshes under 32768 vertices)
+Readers widen narrowed rows back to float32/int32 on load.
+"""
+
+import struct
+import zlib
+
+try:
+    import blosc2
+except ImportError:
+    blosc2 = None
+
+
+def default_codec() -> str:
+    """Best codec available in this environment."""
+    return 'blosc2' if blosc2 is not None else 'zlib'
+
+
+def compress_blob(blob: bytes, codec: str, typesize: int = 4) -> bytes:
+    """Compress a vertex/face/normal BLOB (typesize = bytes per element)."""
+    if codec is None:
+        return blob
+    if codec == 'blosc2':
+        if blosc2 is None:
+            raise RuntimeError("blosc2 not installed. Run: pip install blosc2")
+        # Shuffle groups the bytes of each float32/uint32 - ideal for mesh arrays
+        return blosc2.compress(blob, typesize=typesize, clevel=5,
+                               filter=blosc2.Filter.SHUFFLE, codec=blosc2.Codec.ZSTD)
+    if codec == 'zlib':
+        return zlib.compress(blob, 6)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def decompress_blob(blob: bytes, codec: str) -> bytes:
+    """Inverse of compress_blob (None blobs and codecs pass through)."""
+    if blob is None or codec is None:
+        return blob
+    if codec == 'blosc2':
+        if blosc2 is None:
+            raise RuntimeError("blosc2 not installed. Run: pip install blosc2")
+        return blosc2.decompress(blob)
+    if codec == 'zlib':
+        return zlib.decompress(blob)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+# Narrow mesh dtype: (vertex struct code, face struct code)
+HALF_DTYPE = 'f16i16'
+MESH_DTYPES = {HALF_DTYPE: ('e', 'h')}
+
+# int16 face indices address at most this many vertices
+HALF_DTYPE_MAX_VERTICES = 32767
+
+
+def _repack(blob: bytes, from_code: str, to_code: str) -> bytes:
+    """Re-encode a little-endian array BLOB element by element."""
+    count = len(blob) // struct.calcsize(f'<{from_code}')
+    return struct.pack(f'<{count}{to_code}', *struct.unpack(f'<{count}{from_code}', blob))
+
+
+def narrow_mesh_blobs(v_blob: bytes, f_blob: bytes, dtype: str):
+    """Re-encode float32 vertex / int32 face BLOBs as the given mesh dtype."""
+    if dtype is None:
+        return v_blob, f_blob
+    if dtype not in MESH_DTYPES:
+        raise ValueError(f"Unknown mesh dtype: {dtype}")
+    vertex_code, face_code = MESH_DTYPES[dtype]
+    return _repack(v_blob, 'f', vertex_code), _repack(f_blob, 'i', face_code)
+
+
+def widen_mesh_blobs(v_blob: bytes, f_blob: bytes, dtype: str):
+    """Inverse of narrow_mesh_blobs (back to float32 vertices / int32 faces)."""
+    if dtype is None:
+        return v_blob, f_blob
+    if dtype not in MESH_DTYPES:
+        raise ValueError(f"Unknown mesh dtype: {dtype}")
+    vertex_code, face_code = MESH_DTYPES[dtype]
+    return _repack(v_blob, vertex_code, 'f'), _repack(f_blob, face_code, 'i')
+
+
+# Connection tuning shared by every geometry library writer. The library is
+# kept in persistent WAL mode; NORMAL sync is crash-safe there (a crash can
+# only lose the last commit, never corrupt the file).
+LIBRARY_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",     # 64 MiB page cache
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",   # 256 MiB memory-mapped I/O
+)
+
+
+def apply_library_pragmas(conn):
+    """Apply LIBRARY_PRAGMAS (call outside a transaction - journal_mode can't change inside one)."""
+    for pragma in LIBRARY_PRAGMAS:
+        conn.execute(pragma)
+
+
+def _has_column(cursor, column: str) -> bool:
+    cursor.execute("PRAGMA table_info(base_geometries)")
+    return any(row[1] == column for row in cursor.fetchall())
+
+
+def has_compression_column(cursor) -> bool:
+    """Check whether base_geometries has the compression column."""
+    return _has_column(cursor, 'compression')
+
+
+def ensure_compression_column(cursor):
+    """Add base_geometries.compression to libraries created before it existed."""
+    if not has_compression_column(cursor):
+        cursor.execute("ALTER TABLE base_geometries ADD COLUMN compression TEXT")
+
+
+def has_dtype_column(cursor) -> bool:
+    """Check whether base_geometries has the dtype column."""
+    return _has_column(cursor, 'dtype')
+
+
+def ensure_dtype_column(cursor):
+    """Add base_geometries.dtype to libraries created before it existed."""
+    if not has_dtype_column(cursor):
+        cursor.execute("ALTER TABLE base_geometries ADD COLUMN dtype TEXT")
@@ -6,16 +6,23 @@ Reads models from SourceFiles/3D_Library/ and adds them to DatabaseFiles/geometr
 """
 
 import numpy as np
+import io
 import struct
 import hashlib
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import re
 
+from blob_compression import apply_library_pragmas, compress_blob, ensure_compression_column
+
 # Paths
 SOURCE_DIR = Path("/home/red1/Documents/bonsai/2Dto3D/SourceFiles/3D_Library")
 LIBRARY_DB = Path("/home/red1/Documents/bonsai/2Dto3D/DatabaseFiles/geometry_library.db")
 
+# Blob compression codec: None (raw), 'blosc2' or 'zlib' - see blob_compression.py
+COMPRESSION = None
+
 # Fixture type mapping based on folder/file names
 FIXTURE_TYPE_MAP = {
     'bicycle': 'bicycle_rack',
@@ -41,62 +48,99 @@ FIXTURE_TYPE_MAP = {
     'atm': 'atm_kiosk',
 }
 
+# Matches one OBJ face token, capturing the vertex index ("12/3/7" -> 12,
+# relative "-1/2" -> -1)
+FACE_INDEX_RE = re.compile(r'(-?\d+)(?:/\S*)?')
+FACE_INDEX_DTYPE = np.dtype([('index', np.int64)])
+
+def fan_triangulate(indices, counts):
+    """Fan-triangulate flat polygon indices given per-face vertex counts."""
+    counts = np.asarray(counts, dtype=np.int64)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # Faces with fewer than 3 vertices contribute no triangles
+    tri_counts = np.maximum(counts - 2, 0)
+    total = int(tri_counts.sum())
+    if total == 0:
+        return np.empty((0, 3), dtype=np.int32)
+
+    # For each output triangle: its face start and fan step (0..n-3)
+    face_start = np.repeat(starts, tri_counts)
+    tri_start = np.repeat(np.cumsum(tri_counts) - tri_counts, tri_counts)
+    step = np.arange(total) - tri_start
+
+    return np.stack([
+        indices[face_start],
+        indices[face_start + step + 1],
+        indices[face_start + step + 2],
+    ], axis=1).astype(np.int32)
+
 def parse_obj(filepath):
     """Parse OBJ file and extract vertices and faces."""
-    vertices = []
-    faces = []
-
-    with open(filepath, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-
-            parts = line.split()
-            if not parts:
-                continue
-
-            if parts[0] == 'v' and len(parts) >= 4:
-                # Vertex
+    v_lines = []
+    f_lines = []
+    f_vertex_counts = []  # Vertices defined before each face (for relative indices)
+
+    # Pre-filter vertex/face records; numeric conversion is done in bulk below
+    for line in Path(filepath).read_text().splitlines():
+        line = line.strip()
+        if line.startswith(('v ', 'v\t')):
+            v_lines.append(line[2:])
+        elif line.startswith(('f ', 'f\t')):
+            f_lines.append(line[2:])
+            f_vertex_counts.append(len(v_lines))
+
+    # Vertices - fast path assumes plain "v x y z" records
+    vertices = np.fromstring(' '.join(v_lines), sep=' ', dtype=np.float32)
+    if vertices.size != 3 * len(v_lines):
+        # Records with extra columns (w, vertex colors): keep x, y, z only
+        vertices = np.array([l.split()[:3] for l in v_lines], dtype=np.float32)
+    vertices = vertices.reshape(-1, 3)
+
+    # Faces - can be v, v/vt, v/vt/vn, or v//vn; keep the vertex index only
+    counts = [len(l.split()) for l in f_lines]
+    indices = np.fromregex(io.StringIO('\n'.join(f_lines)), FACE_INDEX_RE, FACE_INDEX_DTYPE)['index']
+    if indices.size != sum(counts):
+        # Records with non-index tokens (e.g. trailing comments): parse per
+        # token, skipping anything that is not an index
+        indices, counts = [], []
+        for l in f_lines:
+            face_indices = []
+            for part in l.split():
                 try:
-                    x, y, z = float(parts[1]), float(parts[2]), float(parts[3])
-                    vertices.append([x, y, z])
+                    face_indices.append(int(part.split('/')[0]))
                 except ValueError:
                     continue
+            indices.extend(face_indices)
+            counts.append(len(face_indices))
+        indices = np.array(indices, dtype=np.int64)
+
+    # OBJ uses 1-based indexing, or negative indices relative to the vertices
+    # defined so far (-1 = last one)
+    base = np.repeat(np.array(f_vertex_counts, dtype=np.int64), counts)
+    indices = np.where(indices < 0, base + indices, indices - 1)
 
-            elif parts[0] == 'f':
-                # Face - can be v, v/vt, v/vt/vn, or v//vn
-                face_indices = []
-                for part in parts[1:]:
-                    # Extract vertex index (first number before any /)
-                    idx = part.split('/')[0]
-                    try:
-                        # OBJ uses 1-based indexing
-                        face_indices.append(int(idx) - 1)
-                    except ValueError:
-                        continue
-
-                # Triangulate if needed (simple fan triangulation)
-                if len(face_indices) >= 3:
-                    for i in range(1, len(face_indices) - 1):
-                        faces.append([face_indices[0], face_indices[i], face_indices[i+1]])
-
-    return np.array(vertices, dtype=np.float32), np.array(faces, dtype=np.int32)
+    # Triangulate if needed (simple fan triangulation)
+    faces = fan_triangulate(indices, counts)
+
+    return vertices, faces
 
 def center_and_normalize(vertices, target_size=1.0):
-    """Center mesh at origin and normalize to target size."""
+    """Center mesh at origin and normalize to target size (in place)."""
     if len(vertices) == 0:
         return vertices
 
+    # Single bounding-box pass; the centered extent follows from it
+    bbox_min = vertices.min(axis=0)
+    bbox_max = vertices.max(axis=0)
+
     # Center at origin
-    center = (vertices.max(axis=0) + vertices.min(axis=0)) / 2
-    vertices = vertices - center
+    vertices -= (bbox_max + bbox_min) / 2
 
     # Normalize to target size
-    max_extent = np.abs(vertices).max()
+    max_extent = (bbox_max - bbox_min).max() / 2
     if max_extent > 0:
-        scale = target_size / max_extent
-        vertices = vertices * scale
+        vertices *= target_size / max_extent
 
     return vertices
 
@@ -112,37 +156,90 @@ def infer_fixture_type(filepath):
 
     return 'other'
 
-def add_to_library(vertices, faces, fixture_type, fixture_name, ifc_class="IfcFurniture"):
-    """Add model to geometry library database."""
+def library_rows(vertices, faces, fixture_type, fixture_name, ifc_class="IfcFurniture",
+                 compression=COMPRESSION):
+    """Build base_geometries and fixture_catalog rows for one model."""
     # Pack geometry data
     v_blob = vertices.tobytes()
     f_blob = faces.tobytes()
 
-    # Create geometry hash
-    geom_hash = hashlib.md5(v_blob + f_blob).hexdigest()[:16]
+    # Create geometry hash (always over the raw blobs)
+    hasher = hashlib.blake2b(digest_size=8)
+    hasher.update(v_blob)
+    hasher.update(f_blob)
+    geom_hash = hasher.hexdigest()
 
-    conn = sqlite3.connect(LIBRARY_DB)
-    cursor = conn.cursor()
+    geom_row = (geom_hash, compress_blob(v_blob, compression), compress_blob(f_blob, compression),
+                len(vertices), len(faces), compression)
+    catalog_row = (geom_hash, ifc_class, fixture_type, fixture_name, len(vertices), len(faces))
 
-    # Insert geometry
-    cursor.execute('''
-        INSERT OR REPLACE INTO base_geometries
-        (geometry_hash, vertices, faces, normals, vertex_count, face_count)
-        VALUES (?, ?, ?, NULL, ?, ?)
-    ''', (geom_hash, v_blob, f_blob, len(vertices), len(faces)))
+    return geom_hash, geom_row, catalog_row
 
-    # Insert catalog entry
-    cursor.execute('''
-        INSERT OR REPLACE INTO fixture_catalog
-        (geometry_hash, ifc_class, fixture_type, fixture_name, vertex_count, face_count)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (geom_hash, ifc_class, fixture_type, fixture_name, len(vertices), len(faces)))
+def write_library_rows(geom_rows, catalog_rows):
+    """Write geometry and catalog rows to the library in a single transaction."""
+    # Autocommit mode: the library pragmas (same as create_transit_models)
+    # go first, then the batch is bracketed in one explicit transaction
+    conn = sqlite3.connect(LIBRARY_DB, isolation_level=None)
+    apply_library_pragmas(conn)
+    cursor = conn.cursor()
 
-    conn.commit()
-    conn.close()
+    ensure_compression_column(cursor)
+
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        # Insert geometry
+        cursor.executemany('''
+            INSERT OR REPLACE INTO base_geometries
+            (geometry_hash, vertices, faces, normals, vertex_count, face_count, compression)
+            VALUES (?, ?, ?, NULL, ?, ?, ?)
+        ''', geom_rows)
+
+        # Insert catalog entries
+        cursor.executemany('''
+            INSERT OR REPLACE INTO fixture_catalog
+            (geometry_hash, ifc_class, fixture_type, fixture_name, vertex_count, face_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', catalog_rows)
+
+        cursor.execute("COMMIT")
+    except BaseException:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def add_to_library(vertices, faces, fixture_type, fixture_name, ifc_class="IfcFurniture",
+                   compression=COMPRESSION):
+    """Add model to geometry library database."""
+    geom_hash, geom_row, catalog_row = library_rows(vertices, faces, fixture_type, fixture_name,
+                                                    ifc_class, compression)
+    write_library_rows([geom_row], [catalog_row])
 
     return geom_hash
 
+def process_model(obj_file):
+    """Convert one OBJ file to library rows (runs in a worker process).
+
+    Returns None for empty meshes, otherwise
+    (fixture_type, vertex_count, face_count, geom_hash, geom_row, catalog_row).
+    """
+    # Parse OBJ
+    vertices, faces = parse_obj(obj_file)
+
+    if len(vertices) == 0 or len(faces) == 0:
+        return None
+
+    # Center and normalize
+    vertices = center_and_normalize(vertices, target_size=1.0)
+
+    # Infer fixture type
+    fixture_type = infer_fixture_type(obj_file)
+    fixture_name = obj_file.stem.replace('_', ' ').title()
+
+    geom_hash, geom_row, catalog_row = library_rows(vertices, faces, fixture_type, fixture_name)
+
+    return fixture_type, len(vertices), len(faces), geom_hash, geom_row, catalog_row
+
 def convert_all_models():
     """Convert all OBJ files in source directory to library format."""
     print("=" * 60)
@@ -172,39 +269,44 @@ def convert_all_models():
 
     converted = 0
     failed = 0
+    geom_rows = []
+    catalog_rows = []
 
-    for obj_file in obj_files:
-        print(f"Processing: {obj_file.relative_to(SOURCE_DIR)}")
+    # Parse/normalize/hash in worker processes; results come back in file order
+    with ProcessPoolExecutor() as executor:
+        futures = [executor.submit(process_model, obj_file) for obj_file in obj_files]
 
-        try:
-            # Parse OBJ
-            vertices, faces = parse_obj(obj_file)
+        for obj_file, future in zip(obj_files, futures):
+            print(f"Processing: {obj_file.relative_to(SOURCE_DIR)}")
 
-            if len(vertices) == 0 or len(faces) == 0:
-                print(f"  Warning: Empty mesh, skipping")
-                failed += 1
-                continue
+            try:
+                result = future.result()
 
-            # Center and normalize
-            vertices = center_and_normalize(vertices, target_size=1.0)
+                if result is None:
+                    print(f"  Warning: Empty mesh, skipping")
+                    failed += 1
+                    continue
+
+                fixture_type, vertex_count, face_count, geom_hash, geom_row, catalog_row = result
 
-            # Infer fixture type
-            fixture_type = infer_fixture_type(obj_file)
-            fixture_name = obj_file.stem.replace('_', ' ').title()
+                # Queue for library (written in one batch below)
+                geom_rows.append(geom_row)
+                catalog_rows.append(catalog_row)
 
-            # Add to library
-            geom_hash = add_to_library(vertices, faces, fixture_type, fixture_name)
+                print(f"  Type: {fixture_type}")
+                print(f"  Vertices: {vertex_count}, Faces: {face_count}")
+                print(f"  Hash: {geom_hash}")
+                print()
 
-            print(f"  Type: {fixture_type}")
-            print(f"  Vertices: {len(vertices)}, Faces: {len(faces)}")
-            print(f"  Hash: {geom_hash}")
-            print()
+                converted += 1
 
-            converted += 1
+            except Exception as e:
+                print(f"  Error: {e}")
+                failed += 1
 
-        except Exception as e:
-            print(f"  Error: {e}")
-            failed += 1
+    # Add to library
+    if geom_rows:
+        write_library_rows(geom_rows, catalog_rows)
 
     print("=" * 60)
     print("CONVERSION COMPLETE")
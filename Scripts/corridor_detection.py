@@ -9,8 +9,50 @@ and classify corridor types for intelligent MEP routing.
 import sqlite3
 import math
 from typing import List, Tuple, Dict
-from dataclasses import dataclass
-from collections import defaultdict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+def _pairs_in_distance_band(coord: np.ndarray, rows: np.ndarray,
+                            min_dist: float, max_dist: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find index pairs (i, j) with i in rows, j > i and min_dist <= |coord[j] - coord[i]| <= max_dist.
+
+    Sorts coord once and binary-searches the band on each side of every row,
+    so only near neighbours are ever materialized (O(N log N + K), not O(N²)).
+
+    Returns:
+        (i, j) index arrays, ordered by i then j
+    """
+    order = np.argsort(coord, kind='stable')
+    ordered = coord[order]
+    origin = coord[rows]
+
+    # Slightly widened search windows; exact bounds are re-checked below
+    slack = 1e-9 * max(1.0, max_dist)
+
+    pair_rows = []
+    pair_cols = []
+    for lower, upper in ((origin + min_dist, origin + max_dist),
+                         (origin - max_dist, origin - min_dist)):
+        start = np.searchsorted(ordered, lower - slack, side='left')
+        stop = np.searchsorted(ordered, upper + slack, side='right')
+        counts = np.maximum(stop - start, 0)
+
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_rows.append(np.repeat(rows, counts))
+        pair_cols.append(order[np.repeat(start, counts) + offsets])
+
+    i = np.concatenate(pair_rows)
+    j = np.concatenate(pair_cols)
+
+    distance = np.abs(coord[j] - coord[i])
+    keep = (j > i) & (distance >= min_dist) & (distance <= max_dist)
+
+    # Unique pair keys also restore (i, j) ordering
+    keys = np.unique(i[keep] * len(coord) + j[keep])
+    return keys // len(coord), keys % len(coord)
 
 
 @dataclass
@@ -29,6 +71,56 @@ class Wall:
         return ((self.start_x + self.end_x) / 2, (self.start_y + self.end_y) / 2)
 
 
+@dataclass
+class WallArrays:
+    """Wall segments stored as parallel arrays (structure-of-arrays)."""
+    guids: List[str]
+    start_x: np.ndarray
+    start_y: np.ndarray
+    end_x: np.ndarray
+    end_y: np.ndarray
+    length: np.ndarray
+    angle: np.ndarray  # 0-360 degrees
+
+    # Derived once per load: per-wall extents and orientation lookup
+    min_x: np.ndarray = field(init=False)
+    max_x: np.ndarray = field(init=False)
+    min_y: np.ndarray = field(init=False)
+    max_y: np.ndarray = field(init=False)
+    vertical: np.ndarray = field(init=False)  # True for 45-135° (mod 180)
+
+    def __post_init__(self):
+        self.min_x = np.minimum(self.start_x, self.end_x)
+        self.max_x = np.maximum(self.start_x, self.end_x)
+        self.min_y = np.minimum(self.start_y, self.end_y)
+        self.max_y = np.maximum(self.start_y, self.end_y)
+        self.vertical = np.abs(self.angle % 180 - 90) < 45
+
+    @classmethod
+    def empty(cls) -> 'WallArrays':
+        """Create a wall set with no walls."""
+        return cls([], *(np.empty(0) for _ in range(6)))
+
+    def __len__(self) -> int:
+        return len(self.guids)
+
+    def midpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get wall midpoints as (x, y) arrays."""
+        return ((self.start_x + self.end_x) / 2, (self.start_y + self.end_y) / 2)
+
+    def wall(self, index: int) -> Wall:
+        """Materialize a single wall as a Wall record."""
+        return Wall(
+            guid=self.guids[index],
+            start_x=float(self.start_x[index]),
+            start_y=float(self.start_y[index]),
+            end_x=float(self.end_x[index]),
+            end_y=float(self.end_y[index]),
+            length=float(self.length[index]),
+            angle=float(self.angle[index])
+        )
+
+
 @dataclass
 class Corridor:
     """Represents a detected corridor."""
@@ -54,25 +146,21 @@ class Corridor:
         if len(self.centerline_points) < 2:
             return self.centerline_points
 
-        routing_points = [self.centerline_points[0]]
+        points = np.asarray(self.centerline_points, dtype=np.float64)
+        deltas = np.diff(points, axis=0)
+        seg_lengths = np.sqrt(deltas[:, 0] * deltas[:, 0] + deltas[:, 1] * deltas[:, 1])
 
-        for i in range(1, len(self.centerline_points)):
-            start = self.centerline_points[i-1]
-            end = self.centerline_points[i]
+        # Add intermediate points if segment is long (zero-length segments add none)
+        num_segments = np.where(seg_lengths > 0, np.maximum(1, (seg_lengths / segment_length).astype(int)), 0)
 
-            dx = end[0] - start[0]
-            dy = end[1] - start[1]
-            seg_length = math.sqrt(dx*dx + dy*dy)
+        # For every output point: its source segment and step j (1..num_segments)
+        seg_index = np.repeat(np.arange(len(deltas)), num_segments)
+        step = np.arange(1, len(seg_index) + 1) - np.repeat(np.cumsum(num_segments) - num_segments, num_segments)
+        t = step / num_segments[seg_index]
 
-            if seg_length > 0:
-                # Add intermediate points if segment is long
-                num_segments = max(1, int(seg_length / segment_length))
-                for j in range(1, num_segments + 1):
-                    t = j / num_segments
-                    point = (start[0] + dx * t, start[1] + dy * t)
-                    routing_points.append(point)
+        intermediate = points[seg_index] + deltas[seg_index] * t[:, None]
 
-        return routing_points
+        return [self.centerline_points[0]] + [tuple(p) for p in intermediate.tolist()]
 
 
 class CorridorDetector:
@@ -80,13 +168,24 @@ class CorridorDetector:
 
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self.walls: List[Wall] = []
+        self.walls = WallArrays.empty()
         self.corridors: List[Corridor] = []
 
+        # One connection for the detector's lifetime (call close() when done)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -65536;
+        """)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
     def load_walls(self):
         """Load all walls from the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
 
         # Get all walls with their positions
         cursor.execute("""
@@ -103,36 +202,41 @@ class CorridorDetector:
             ORDER BY et.center_x, et.center_y
         """)
 
-        for row in cursor.fetchall():
-            guid, cx, cy, cz, length, rotation_z = row
-
-            # Convert rotation to angle (rotation_z is in radians from database)
-            angle = math.degrees(rotation_z) % 360
-
-            # Calculate wall endpoints based on center, length, and rotation
-            half_len = length / 2
-            rad = rotation_z  # FIXED: rotation_z is ALREADY in radians, don't convert again!
-
-            start_x = cx - half_len * math.cos(rad)
-            start_y = cy - half_len * math.sin(rad)
-            end_x = cx + half_len * math.cos(rad)
-            end_y = cy + half_len * math.sin(rad)
-
-            wall = Wall(
-                guid=guid,
-                start_x=start_x,
-                start_y=start_y,
-                end_x=end_x,
-                end_y=end_y,
-                length=length,
-                angle=angle
-            )
-            self.walls.append(wall)
+        # Stream rows in batches straight into float arrays (no full list of tuples)
+        cursor.arraysize = 10000
+        guids = []
+        chunks = [np.empty((0, 5))]
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            guids.extend(row[0] for row in rows)
+            chunks.append(np.array([row[1:] for row in rows], dtype=np.float64))
+
+        cx, cy, _cz, length, rotation_z = np.concatenate(chunks).T
+
+        # Convert rotation to angle (rotation_z is in radians from database)
+        angle = np.degrees(rotation_z) % 360
+
+        # Calculate wall endpoints based on center, length, and rotation
+        # rotation_z is ALREADY in radians, don't convert again!
+        half_len = length / 2
+        dx = half_len * np.cos(rotation_z)
+        dy = half_len * np.sin(rotation_z)
+
+        self.walls = WallArrays(
+            guids=guids,
+            start_x=cx - dx,
+            start_y=cy - dy,
+            end_x=cx + dx,
+            end_y=cy + dy,
+            length=length,
+            angle=angle
+        )
 
-        conn.close()
         print(f"Loaded {len(self.walls)} walls from database")
 
-    def find_parallel_walls(self, angle_tolerance: float = 5.0) -> Dict[int, List[Wall]]:
+    def find_parallel_walls(self, angle_tolerance: float = 5.0) -> Dict[float, np.ndarray]:
         """
         Group walls by similar angles (parallel walls).
 
@@ -140,20 +244,26 @@ class CorridorDetector:
             angle_tolerance: Maximum angle difference to consider walls parallel (degrees)
 
         Returns:
-            Dictionary mapping angle groups to lists of parallel walls
+            Dictionary mapping angle groups to index arrays into self.walls
         """
-        angle_groups = defaultdict(list)
+        # Normalize angle to 0-180 (since parallel walls can face opposite directions)
+        normalized_angle = self.walls.angle % 180
 
-        for wall in self.walls:
-            # Normalize angle to 0-180 (since parallel walls can face opposite directions)
-            normalized_angle = wall.angle % 180
+        # Round to nearest tolerance degree for grouping
+        angle_keys = np.round(normalized_angle / angle_tolerance) * angle_tolerance
 
-            # Round to nearest tolerance degree for grouping
-            angle_key = round(normalized_angle / angle_tolerance) * angle_tolerance
-            angle_groups[angle_key].append(wall)
+        # Keep groups in order of first appearance
+        unique_keys, first_index, inverse = np.unique(angle_keys, return_index=True, return_inverse=True)
+        wall_order = np.argsort(inverse, kind='stable')
+        group_sizes = np.bincount(inverse, minlength=len(unique_keys))
+        group_members = np.split(wall_order, np.cumsum(group_sizes)[:-1])
 
         # Filter groups with at least 2 walls (potential corridor candidates)
-        parallel_groups = {k: v for k, v in angle_groups.items() if len(v) >= 2}
+        parallel_groups = {
+            float(unique_keys[g]): group_members[g]
+            for g in np.argsort(first_index)
+            if group_sizes[g] >= 2
+        }
 
         print(f"Found {len(parallel_groups)} groups of parallel walls")
         for angle, walls in parallel_groups.items():
@@ -161,12 +271,12 @@ class CorridorDetector:
 
         return parallel_groups
 
-    def detect_corridor_pairs(self, parallel_walls: List[Wall], max_width: float = 8.0, min_width: float = 1.5, debug: bool = True) -> List[Tuple[Wall, Wall, float]]:
+    def detect_corridor_pairs(self, parallel_walls: np.ndarray, max_width: float = 8.0, min_width: float = 1.5, debug: bool = True) -> List[Tuple[Wall, Wall, float]]:
         """
         Detect pairs of parallel walls that form corridors.
 
         Args:
-            parallel_walls: List of parallel walls
+            parallel_walls: Indices into self.walls of one parallel group
             max_width: Maximum corridor width (meters)
             min_width: Minimum corridor width (meters)
             debug: Print debug info
@@ -174,46 +284,52 @@ class CorridorDetector:
         Returns:
             List of (wall1, wall2, width) tuples representing corridor pairs
         """
-        corridor_pairs = []
-        checked_pairs = 0
-        width_rejected = 0
-        overlap_rejected = 0
-
-        # Check each pair of parallel walls
-        for i, wall1 in enumerate(parallel_walls):
-            for wall2 in parallel_walls[i+1:]:
-                checked_pairs += 1
-
-                # Calculate PERPENDICULAR distance between parallel walls (FIXED!)
-                # Old code used Euclidean distance of midpoints (WRONG)
-                # New code calculates perpendicular distance based on wall angle
-                mid1 = wall1.midpoint()
-                mid2 = wall2.midpoint()
-
-                # Calculate perpendicular distance correctly based on wall orientation
-                # For horizontal walls (angle ~0° or ~180°): distance is difference in Y
-                # For vertical walls (angle ~90° or ~270°): distance is difference in X
-                angle_normalized = wall1.angle % 180  # 0-180 range
-
-                if abs(angle_normalized - 90) < 45:  # Vertical wall (45-135°)
-                    # Perpendicular distance = difference in X coordinates
-                    distance = abs(mid2[0] - mid1[0])
-                else:  # Horizontal wall (0-45° or 135-180°)
-                    # Perpendicular distance = difference in Y coordinates
-                    distance = abs(mid2[1] - mid1[1])
-
-                # Check if walls are within corridor width range
-                if min_width <= distance <= max_width:
-                    # Check if walls have significant overlap (corridor candidates)
-                    # Project walls onto their common axis to check overlap
-                    if self._check_wall_overlap(wall1, wall2):
-                        corridor_pairs.append((wall1, wall2, distance))
-                    else:
-                        overlap_rejected += 1
-                        if debug and overlap_rejected <= 5:  # Show first 5 rejections
-                            print(f"  DEBUG: Rejected (no overlap): walls at {mid1}, {mid2}, distance={distance:.2f}m")
-                else:
-                    width_rejected += 1
+        group = np.asarray(parallel_walls)
+        mid_x, mid_y = self.walls.midpoints()
+        mid_x = mid_x[group]
+        mid_y = mid_y[group]
+
+        # Calculate PERPENDICULAR distance between parallel walls for every pair
+        # For horizontal walls (angle ~0° or ~180°): distance is difference in Y
+        # For vertical walls (angle ~90° or ~270°): distance is difference in X
+        # Orientation is taken from the first wall of each pair (row)
+        vertical = self.walls.vertical[group]
+
+        # Each unordered pair once (i < j), within corridor width range
+        # Sorted sweep per axis prunes to near neighbours instead of all N² pairs
+        local = np.arange(len(group))
+        rows_v, cols_v = _pairs_in_distance_band(mid_x, local[vertical], min_width, max_width)
+        rows_h, cols_h = _pairs_in_distance_band(mid_y, local[~vertical], min_width, max_width)
+        rows = np.concatenate((rows_v, rows_h))
+        cols = np.concatenate((cols_v, cols_h))
+        pair_order = np.lexsort((cols, rows))
+        rows = rows[pair_order]
+        cols = cols[pair_order]
+
+        distance = np.where(
+            vertical[rows],
+            np.abs(mid_x[cols] - mid_x[rows]),
+            np.abs(mid_y[cols] - mid_y[rows])
+        )
+
+        # Check if walls have significant overlap (corridor candidates)
+        overlaps = self._check_wall_overlap(group[rows], group[cols])
+
+        checked_pairs = len(group) * (len(group) - 1) // 2
+        width_rejected = checked_pairs - len(rows)
+        overlap_rejected = int(np.count_nonzero(~overlaps))
+
+        if debug:
+            rejected = np.flatnonzero(~overlaps)[:5]  # Show first 5 rejections
+            for i, j, dist in zip(rows[rejected], cols[rejected], distance[rejected]):
+                mid1 = (float(mid_x[i]), float(mid_y[i]))
+                mid2 = (float(mid_x[j]), float(mid_y[j]))
+                print(f"  DEBUG: Rejected (no overlap): walls at {mid1}, {mid2}, distance={dist:.2f}m")
+
+        corridor_pairs = [
+            (self.walls.wall(group[i]), self.walls.wall(group[j]), float(dist))
+            for i, j, dist in zip(rows[overlaps], cols[overlaps], distance[overlaps])
+        ]
 
         if debug:
             print(f"\nDEBUG: Corridor pair detection:")
@@ -224,40 +340,30 @@ class CorridorDetector:
 
         return corridor_pairs
 
-    def _check_wall_overlap(self, wall1: Wall, wall2: Wall, min_overlap: float = 0.5) -> bool:
+    def _check_wall_overlap(self, first: np.ndarray, second: np.ndarray, min_overlap: float = 0.5) -> np.ndarray:
         """
-        Check if two parallel walls have significant overlap.
+        Check which pairs of parallel walls have significant overlap.
 
         Args:
-            wall1, wall2: Walls to check
+            first, second: Index arrays into self.walls, one entry per pair
             min_overlap: Minimum overlap length required (meters) - REDUCED from 2.0m to 0.5m
 
         Returns:
-            True if walls overlap sufficiently
+            Boolean array, True where walls overlap sufficiently
         """
-        # For simplicity, check if walls are aligned in the perpendicular direction
-        # More accurate implementation would project walls onto common axis
-
-        # Normalize angle to match distance calculation (CONSISTENT!)
-        angle_normalized = wall1.angle % 180  # 0-180 range
+        walls = self.walls
 
         # Check overlap based on wall orientation (MUST match distance calculation!)
-        if abs(angle_normalized - 90) < 45:  # Vertical wall (45-135°)
-            # Vertical walls - check Y overlap (along the wall direction)
-            wall1_min_y = min(wall1.start_y, wall1.end_y)
-            wall1_max_y = max(wall1.start_y, wall1.end_y)
-            wall2_min_y = min(wall2.start_y, wall2.end_y)
-            wall2_max_y = max(wall2.start_y, wall2.end_y)
-
-            overlap = min(wall1_max_y, wall2_max_y) - max(wall1_min_y, wall2_min_y)
-        else:  # Horizontal wall (0-45° or 135-180°)
-            # Horizontal walls - check X overlap (along the wall direction)
-            wall1_min_x = min(wall1.start_x, wall1.end_x)
-            wall1_max_x = max(wall1.start_x, wall1.end_x)
-            wall2_min_x = min(wall2.start_x, wall2.end_x)
-            wall2_max_x = max(wall2.start_x, wall2.end_x)
-
-            overlap = min(wall1_max_x, wall2_max_x) - max(wall1_min_x, wall2_min_x)
+        # Vertical walls (45-135°) - check Y overlap (along the wall direction)
+        # Horizontal walls - check X overlap (along the wall direction)
+        vertical = walls.vertical[first]
+
+        wall1_min = np.where(vertical, walls.min_y[first], walls.min_x[first])
+        wall1_max = np.where(vertical, walls.max_y[first], walls.max_x[first])
+        wall2_min = np.where(vertical, walls.min_y[second], walls.min_x[second])
+        wall2_max = np.where(vertical, walls.max_y[second], walls.max_x[second])
+
+        overlap = np.minimum(wall1_max, wall2_max) - np.maximum(wall1_min, wall2_min)
 
         return overlap >= min_overlap
 
@@ -408,6 +514,7 @@ def main():
 
     detector = CorridorDetector(db_path)
     corridors = detector.detect_corridors()
+    detector.close()
 
     print(f"\n✅ Detected {len(corridors)} corridors")
     print("✅ Ready for intelligent routing!")
@@ -5,99 +5,155 @@ Create simple parametric 3D models for transit fixtures not found in free librar
 These are basic but recognizable shapes that can be added to the geometry library.
 """
 
+import argparse
+import os
 import numpy as np
 import struct
+from contextlib import contextmanager, suppress
+from functools import lru_cache
 import hashlib
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
+from blob_compression import (
+    HALF_DTYPE_MAX_VERTICES, apply_library_pragmas, compress_blob, ensure_compression_column,
+    ensure_dtype_column, narrow_mesh_blobs, widen_mesh_blobs,
+)
+
 # Output paths
 LIBRARY_DB = Path("/home/red1/Documents/bonsai/2Dto3D/DatabaseFiles/geometry_library.db")
 OBJ_OUTPUT = Path("/home/red1/Documents/bonsai/2Dto3D/SourceFiles/3D_Library/generated")
 
+# Meshes above this vertex count are exported as binary PLY instead of OBJ
+PLY_VERTEX_THRESHOLD = 1000
+
+# Blob compression codec: None (raw), 'blosc2' or 'zlib' - see blob_compression.py
+COMPRESSION = None
+
+# Mesh blob dtype: None (float32/int32) or 'f16i16' (half-size; meshes under
+# 32768 vertices only, larger ones fall back to None) - see blob_compression.py
+MESH_DTYPE = None
+
+# Unit box template: X/Y centered on origin, Z from 0 (base) to 1 (top)
+UNIT_BOX_VERTICES = np.array([
+    # Bottom face
+    [-0.5, -0.5, 0], [0.5, -0.5, 0], [0.5, 0.5, 0], [-0.5, 0.5, 0],
+    # Top face
+    [-0.5, -0.5, 1], [0.5, -0.5, 1], [0.5, 0.5, 1], [-0.5, 0.5, 1],
+], dtype=np.float64)
+
+UNIT_BOX_FACES = np.array([
+    # Bottom
+    [0, 2, 1], [0, 3, 2],
+    # Top
+    [4, 5, 6], [4, 6, 7],
+    # Front
+    [0, 1, 5], [0, 5, 4],
+    # Back
+    [2, 3, 7], [2, 7, 6],
+    # Left
+    [0, 4, 7], [0, 7, 3],
+    # Right
+    [1, 2, 6], [1, 6, 5],
+], dtype=np.int32)
+UNIT_BOX_FACES.setflags(write=False)  # Shared by every box - never mutate
+
+@lru_cache(maxsize=64)
+def _scaled_box(width, depth, height):
+    """Unit box scaled to (width, depth, height), cached per shape (read-only)."""
+    vertices = UNIT_BOX_VERTICES * (width, depth, height)
+    vertices.flags.writeable = False
+    return vertices
+
 def create_box(width, depth, height, center=(0, 0, 0)):
     """Create a simple box mesh centered at origin."""
-    w, d, h = width/2, depth/2, height/2
-    cx, cy, cz = center
-
-    vertices = np.array([
-        # Bottom face
-        [cx-w, cy-d, cz], [cx+w, cy-d, cz], [cx+w, cy+d, cz], [cx-w, cy+d, cz],
-        # Top face
-        [cx-w, cy-d, cz+h*2], [cx+w, cy-d, cz+h*2], [cx+w, cy+d, cz+h*2], [cx-w, cy+d, cz+h*2],
-    ], dtype=np.float32)
-
-    faces = np.array([
-        # Bottom
-        [0, 2, 1], [0, 3, 2],
-        # Top
-        [4, 5, 6], [4, 6, 7],
-        # Front
-        [0, 1, 5], [0, 5, 4],
-        # Back
-        [2, 3, 7], [2, 7, 6],
-        # Left
-        [0, 4, 7], [0, 7, 3],
-        # Right
-        [1, 2, 6], [1, 6, 5],
-    ], dtype=np.int32)
-
-    return vertices, faces
+    # Translate the cached scaled template (base of the box sits at center Z)
+    vertices = (_scaled_box(width, depth, height) + center).astype(np.float32)
+
+    return vertices, UNIT_BOX_FACES
+
+def _unit_circle(segments):
+    """cos/sin of evenly spaced angles around the circle (read-only)."""
+    angles = 2 * np.pi * np.arange(segments) / segments
+    cos, sin = np.cos(angles), np.sin(angles)
+    cos.flags.writeable = False
+    sin.flags.writeable = False
+    return cos, sin
+
+# Trig lookup for the segment counts the fixtures use (kept float64 so
+# the float32 vertices match direct computation bit for bit)
+TRIG_LUT = {n: _unit_circle(n) for n in (8, 12, 16, 24, 32)}
+
+@lru_cache(maxsize=64)
+def _cylinder_ring(radius, segments):
+    """Ring offsets (radius * cos, radius * sin) per segment, cached per shape (read-only)."""
+    cos, sin = TRIG_LUT.get(segments) or _unit_circle(segments)
+    x = radius * cos
+    y = radius * sin
+    x.flags.writeable = False
+    y.flags.writeable = False
+    return x, y
+
+@lru_cache(maxsize=64)
+def _cylinder_faces(segments):
+    """Cylinder face indices, which depend only on the segment count (read-only)."""
+    i = np.arange(segments)
+    b1 = 2 + i * 2
+    t1 = 3 + i * 2
+    b2 = 2 + ((i + 1) % segments) * 2
+    t2 = 3 + ((i + 1) % segments) * 2
+
+    bottom = np.stack([np.zeros_like(i), b2, b1], axis=1)
+    top = np.stack([np.ones_like(i), t1, t2], axis=1)
+    # Side faces: two triangles per segment, kept adjacent
+    sides = np.stack([
+        np.stack([b1, b2, t2], axis=1),
+        np.stack([b1, t2, t1], axis=1),
+    ], axis=1).reshape(-1, 3)
+
+    faces = np.concatenate([bottom, top, sides]).astype(np.int32)
+    faces.flags.writeable = False
+    return faces
 
 def create_cylinder(radius, height, segments=16, center=(0, 0, 0)):
     """Create a cylinder mesh."""
     cx, cy, cz = center
-    vertices = []
-    faces = []
-
-    # Bottom center
-    vertices.append([cx, cy, cz])
-    # Top center
-    vertices.append([cx, cy, cz + height])
-
-    # Circle vertices
-    for i in range(segments):
-        angle = 2 * np.pi * i / segments
-        x = cx + radius * np.cos(angle)
-        y = cy + radius * np.sin(angle)
-        vertices.append([x, y, cz])           # Bottom
-        vertices.append([x, y, cz + height])  # Top
 
-    # Bottom face
-    for i in range(segments):
-        i1 = 2 + i * 2
-        i2 = 2 + ((i + 1) % segments) * 2
-        faces.append([0, i2, i1])
+    # Circle vertices (all segments at once)
+    ring_x, ring_y = _cylinder_ring(radius, segments)
+    x = cx + ring_x
+    y = cy + ring_y
 
-    # Top face
-    for i in range(segments):
-        i1 = 3 + i * 2
-        i2 = 3 + ((i + 1) % segments) * 2
-        faces.append([1, i1, i2])
-
-    # Side faces
-    for i in range(segments):
-        b1 = 2 + i * 2
-        t1 = 3 + i * 2
-        b2 = 2 + ((i + 1) % segments) * 2
-        t2 = 3 + ((i + 1) % segments) * 2
-        faces.append([b1, b2, t2])
-        faces.append([b1, t2, t1])
-
-    return np.array(vertices, dtype=np.float32), np.array(faces, dtype=np.int32)
+    # Layout: bottom center, top center, then interleaved bottom/top ring vertices
+    vertices = np.empty((2 + 2 * segments, 3), dtype=np.float32)
+    vertices[0] = (cx, cy, cz)           # Bottom center
+    vertices[1] = (cx, cy, cz + height)  # Top center
+    vertices[2::2, 0] = x                # Bottom
+    vertices[2::2, 1] = y
+    vertices[2::2, 2] = cz
+    vertices[3::2, 0] = x                # Top
+    vertices[3::2, 1] = y
+    vertices[3::2, 2] = cz + height
+
+    return vertices, _cylinder_faces(segments)
 
 def merge_meshes(mesh_list):
     """Merge multiple meshes into one."""
-    all_vertices = []
-    all_faces = []
+    # Preallocate the merged buffers and fill slices (no intermediate lists)
+    all_vertices = np.empty((sum(len(v) for v, _ in mesh_list), 3), dtype=np.float32)
+    all_faces = np.empty((sum(len(f) for _, f in mesh_list), 3), dtype=np.int32)
     vertex_offset = 0
+    face_offset = 0
 
     for vertices, faces in mesh_list:
-        all_vertices.append(vertices)
-        all_faces.append(faces + vertex_offset)
+        all_vertices[vertex_offset:vertex_offset + len(vertices)] = vertices
+        np.add(faces, vertex_offset, out=all_faces[face_offset:face_offset + len(faces)])
         vertex_offset += len(vertices)
+        face_offset += len(faces)
 
-    return np.vstack(all_vertices), np.vstack(all_faces)
+    return all_vertices, all_faces
 
 # =============================================================================
 # Transit Fixture Models
@@ -206,6 +262,72 @@ def create_info_kiosk():
     vertices, faces = merge_meshes([(base_v, base_f), (stem_v, stem_f), screen])
     return vertices, faces, "info_kiosk"
 
+def build_blade_vertices(num_blades, sections, inner_radius, blade_length,
+                         blade_width, blade_thickness, z_base):
+    """Vertices for all fan blades at once, shape (blades * (sections+1) * 4, 3)."""
+    # Section parameters along the blade, shape (S+1,)
+    t = np.arange(sections + 1) / sections
+    r = inner_radius + t * blade_length
+    hw = blade_width / 2 * (1 - t * 0.3)  # Taper toward tip
+    ht = blade_thickness / 2
+
+    # Blade directions, shape (B, 1); blades extend outward from motor
+    angle = (2 * np.pi * np.arange(num_blades) / num_blades)[:, None]
+
+    # Local coords -> world coords, shape (B, S+1)
+    x_base = r * np.cos(angle)
+    y_base = r * np.sin(angle)
+
+    # Perpendicular to blade direction, scaled by section half-width
+    offset_x = -np.sin(angle) * hw
+    offset_y = np.cos(angle) * hw
+
+    # 4 corners per section: bottom-left, top-left, top-right, bottom-right
+    side = np.array([1, 1, -1, -1])
+    z = z_base + np.array([-ht, ht, ht, -ht])
+
+    blade_verts = np.empty((num_blades, sections + 1, 4, 3), dtype=np.float32)
+    blade_verts[..., 0] = x_base[..., None] + side * offset_x[..., None]
+    blade_verts[..., 1] = y_base[..., None] + side * offset_y[..., None]
+    blade_verts[..., 2] = z
+
+    return blade_verts.reshape(-1, 3)
+
+@lru_cache(maxsize=None)
+def blade_face_indices(num_blades, sections):
+    """Face indices for all fan blades (depends only on topology, so cached read-only)."""
+    # Faces between sections (front, back, top, bottom), same for every blade
+    base = 4 * np.arange(sections)[:, None]
+    next_base = base + 4
+    section_faces = np.stack([
+        # Front face
+        np.hstack([base + 0, next_base + 0, next_base + 1]),
+        np.hstack([base + 0, next_base + 1, base + 1]),
+        # Back face
+        np.hstack([base + 2, next_base + 2, next_base + 3]),
+        np.hstack([base + 2, next_base + 3, base + 3]),
+        # Top face
+        np.hstack([base + 1, next_base + 1, next_base + 2]),
+        np.hstack([base + 1, next_base + 2, base + 2]),
+        # Bottom face
+        np.hstack([base + 0, base + 3, next_base + 3]),
+        np.hstack([base + 0, next_base + 3, next_base + 0]),
+    ], axis=1).reshape(-1, 3)
+
+    # Cap ends: inner cap, then outer cap (tip)
+    tip = sections * 4
+    cap_faces = np.array([
+        [0, 1, 2], [0, 2, 3],
+        [tip + 0, tip + 3, tip + 2], [tip + 0, tip + 2, tip + 1],
+    ])
+
+    blade_faces = np.concatenate([section_faces, cap_faces])
+    blade_offsets = (np.arange(num_blades) * (sections + 1) * 4)[:, None, None]
+    blade_faces = (blade_faces + blade_offsets).reshape(-1, 3).astype(np.int32)
+    blade_faces.flags.writeable = False
+
+    return blade_faces
+
 def create_ceiling_fan():
     """Detailed ceiling fan with 5 blades - high polygon for impressive visuals."""
     meshes = []
@@ -228,87 +350,18 @@ def create_ceiling_fan():
     blade_width = 0.12
     blade_thickness = 0.015
 
-    for i in range(num_blades):
-        angle = 2 * np.pi * i / num_blades
-
-        # Create blade as angled box
-        # Blade extends outward from motor
-        blade_verts = []
-        blade_faces = []
-
-        # Inner edge (near motor)
-        inner_radius = 0.1
-        outer_radius = inner_radius + blade_length
-
-        # Blade has 8 vertices per section, multiple sections for detail
-        sections = 8  # More sections = smoother blade
-
-        for s in range(sections + 1):
-            t = s / sections
-            r = inner_radius + t * blade_length
-
-            # Blade twist angle (fans have twisted blades)
-            twist = t * 0.3  # Radians
+    # Inner edge (near motor)
+    inner_radius = 0.1
 
-            # 4 corners at this section
-            hw = blade_width / 2 * (1 - t * 0.3)  # Taper toward tip
-            ht = blade_thickness / 2
+    # Blade has 4 vertices per section, multiple sections for detail
+    sections = 8  # More sections = smoother blade
+    z_base = -0.22  # At motor level
 
-            # Rotate by blade angle and twist
-            cos_a = np.cos(angle + twist)
-            sin_a = np.sin(angle + twist)
+    blade_verts = build_blade_vertices(num_blades, sections, inner_radius,
+                                       blade_length, blade_width, blade_thickness, z_base)
+    blade_faces = blade_face_indices(num_blades, sections)
 
-            # Local coords -> world coords
-            x_base = r * np.cos(angle)
-            y_base = r * np.sin(angle)
-
-            # Perpendicular to blade direction
-            perp_x = -np.sin(angle)
-            perp_y = np.cos(angle)
-
-            # Add 4 vertices for this section
-            z_base = -0.22  # At motor level
-            blade_verts.extend([
-                [x_base + perp_x * hw, y_base + perp_y * hw, z_base - ht],  # Bottom-left
-                [x_base + perp_x * hw, y_base + perp_y * hw, z_base + ht],  # Top-left
-                [x_base - perp_x * hw, y_base - perp_y * hw, z_base + ht],  # Top-right
-                [x_base - perp_x * hw, y_base - perp_y * hw, z_base - ht],  # Bottom-right
-            ])
-
-        # Create faces between sections
-        for s in range(sections):
-            base = len(blade_verts) - (sections + 1) * 4 + s * 4
-            next_base = base + 4
-
-            # Front face
-            blade_faces.append([base + 0, next_base + 0, next_base + 1])
-            blade_faces.append([base + 0, next_base + 1, base + 1])
-
-            # Back face
-            blade_faces.append([base + 2, next_base + 2, next_base + 3])
-            blade_faces.append([base + 2, next_base + 3, base + 3])
-
-            # Top face
-            blade_faces.append([base + 1, next_base + 1, next_base + 2])
-            blade_faces.append([base + 1, next_base + 2, base + 2])
-
-            # Bottom face
-            blade_faces.append([base + 0, base + 3, next_base + 3])
-            blade_faces.append([base + 0, next_base + 3, next_base + 0])
-
-        # Cap ends
-        # Inner cap
-        base = len(blade_verts) - (sections + 1) * 4
-        blade_faces.append([base + 0, base + 1, base + 2])
-        blade_faces.append([base + 0, base + 2, base + 3])
-
-        # Outer cap (tip)
-        tip = len(blade_verts) - 4
-        blade_faces.append([tip + 0, tip + 3, tip + 2])
-        blade_faces.append([tip + 0, tip + 2, tip + 1])
-
-        meshes.append((np.array(blade_verts, dtype=np.float32),
-                      np.array(blade_faces, dtype=np.int32)))
+    meshes.append((blade_verts, blade_faces))
 
     vertices, faces = merge_meshes(meshes)
     return vertices, faces, "ceiling_fan"
@@ -344,70 +397,215 @@ def create_bench_seating():
 # Export Functions
 # =============================================================================
 
+@contextmanager
+def atomic_open(filepath, mode='w', **open_kwargs):
+    """Write to a temp file beside filepath, then os.replace it into place."""
+    # Plain open() (not mkstemp) so the file gets the usual umask permissions
+    tmp_path = filepath.with_name(f".{filepath.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, mode, **open_kwargs) as f:
+            yield f
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        # open() itself may have failed, leaving no temp file to remove
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+
+# OBJ record formats (one row each)
+OBJ_VERTEX_FMT = "v %.6f %.6f %.6f\n"
+OBJ_FACE_FMT = "f %d %d %d\n"
+
 def export_obj(vertices, faces, filepath):
     """Export mesh to OBJ format."""
     filepath = Path(filepath)
     filepath.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(filepath, 'w') as f:
-        f.write(f"# Transit fixture model\n")
-        f.write(f"# Vertices: {len(vertices)}, Faces: {len(faces)}\n\n")
+    header = (
+        "# Transit fixture model\n"
+        f"# Vertices: {len(vertices)}, Faces: {len(faces)}\n\n"
+    )
 
-        for v in vertices:
-            f.write(f"v {v[0]:.6f} {v[1]:.6f} {v[2]:.6f}\n")
+    # Build each block with a single %-format over all rows
+    vertex_block = (OBJ_VERTEX_FMT * len(vertices)) % tuple(vertices.ravel().tolist())
 
-        f.write("\n")
+    # OBJ uses 1-based indexing
+    face_block = (OBJ_FACE_FMT * len(faces)) % tuple((faces + 1).ravel().tolist())
 
-        for face in faces:
-            # OBJ uses 1-based indexing
-            f.write(f"f {face[0]+1} {face[1]+1} {face[2]+1}\n")
+    # One write of the whole file; newline='\n' skips newline translation
+    with atomic_open(filepath, 'w', newline='\n') as f:
+        f.write(header + vertex_block + "\n" + face_block)
 
     print(f"  Exported: {filepath}")
 
-def add_to_library(vertices, faces, fixture_type, ifc_class="IfcFurniture"):
-    """Add model to geometry library database."""
-    if not LIBRARY_DB.exists():
-        print(f"  Warning: Library DB not found at {LIBRARY_DB}")
-        return
-
-    # Pack geometry data
-    v_blob = vertices.tobytes()
-    f_blob = faces.tobytes()
-
-    # Create geometry hash
-    geom_hash = hashlib.md5(v_blob + f_blob).hexdigest()[:16]
+# PLY face record: vertex count (uchar) + 3 indices (int32), unpadded
+PLY_FACE_DTYPE = np.dtype([('count', 'u1'), ('indices', '<i4', (3,))])
 
-    conn = sqlite3.connect(LIBRARY_DB)
-    cursor = conn.cursor()
+def export_ply_binary(vertices, faces, filepath):
+    """Export mesh to binary little-endian PLY (header + two buffer writes)."""
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
 
-    # Insert geometry
-    cursor.execute('''
-        INSERT OR REPLACE INTO base_geometries
-        (geometry_hash, vertices, faces, normals, vertex_count, face_count)
-        VALUES (?, ?, ?, NULL, ?, ?)
-    ''', (geom_hash, v_blob, f_blob, len(vertices), len(faces)))
+    header = (
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        "comment Transit fixture model\n"
+        f"element vertex {len(vertices)}\n"
+        "property float x\n"
+        "property float y\n"
+        "property float z\n"
+        f"element face {len(faces)}\n"
+        "property list uchar int vertex_indices\n"
+        "end_header\n"
+    )
+
+    face_records = np.empty(len(faces), dtype=PLY_FACE_DTYPE)
+    face_records['count'] = 3
+    face_records['indices'] = faces
+
+    with atomic_open(filepath, 'wb') as f:
+        f.write(header.encode('ascii'))
+        f.write(vertices.astype('<f4').tobytes())
+        f.write(face_records.tobytes())
 
-    # Insert catalog entry
-    cursor.execute('''
-        INSERT OR REPLACE INTO fixture_catalog
-        (geometry_hash, ifc_class, fixture_type, fixture_name, vertex_count, face_count)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (geom_hash, ifc_class, fixture_type, fixture_type.replace('_', ' ').title(),
-          len(vertices), len(faces)))
+    print(f"  Exported: {filepath}")
 
-    conn.commit()
-    conn.close()
+def face_normals(vertices, faces):
+    """Unit per-face normals, shape (F, 3) float32 (degenerate faces get +Z).
+
+    Same convention as compute_face_normal in geometry_generators.py.
+    """
+    v = vertices.astype(np.float64)
+    v0 = v[faces[:, 0]]
+    normals = np.cross(v[faces[:, 1]] - v0, v[faces[:, 2]] - v0)
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+
+    degenerate = length[:, 0] == 0
+    normals[degenerate] = (0, 0, 1)
+    length[degenerate] = 1
+
+    return (normals / length).astype(np.float32)
+
+def library_rows(vertices, faces, fixture_type, ifc_class="IfcFurniture",
+                 compression=COMPRESSION, dtype=MESH_DTYPE):
+    """Build base_geometries and fixture_catalog rows for one model."""
+    if dtype is not None and len(vertices) > HALF_DTYPE_MAX_VERTICES:
+        dtype = None
+
+    # Pack geometry data; narrowed rows are hashed (and get normals) as readers
+    # will see them after widening back to float32/int32
+    stored_v_blob, stored_f_blob = narrow_mesh_blobs(vertices.tobytes(), faces.tobytes(), dtype)
+    v_blob, f_blob = widen_mesh_blobs(stored_v_blob, stored_f_blob, dtype)
+    if dtype is not None:
+        vertices = np.frombuffer(v_blob, dtype=np.float32).reshape(-1, 3)
+
+    # Normals computed once here, not by every reader
+    n_blob = face_normals(vertices, faces).tobytes()
+
+    # Create geometry hash (always over the uncompressed full-width blobs)
+    hasher = hashlib.blake2b(digest_size=8)
+    hasher.update(v_blob)
+    hasher.update(f_blob)
+    geom_hash = hasher.hexdigest()
+
+    typesize = 2 if dtype is not None else 4
+    geom_row = (geom_hash, compress_blob(stored_v_blob, compression, typesize),
+                compress_blob(stored_f_blob, compression, typesize),
+                compress_blob(n_blob, compression), len(vertices), len(faces), compression, dtype)
+    catalog_row = (geom_hash, ifc_class, fixture_type, fixture_type.replace('_', ' ').title(),
+                   len(vertices), len(faces))
+
+    return geom_row, catalog_row
+
+# Upgrade DDL for libraries created before the catalog was indexed.
+# fixture_type is not unique (several models share a type), and
+# base_geometries.geometry_hash is already its primary key.
+LIBRARY_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_fixture_catalog_type "
+    "ON fixture_catalog(fixture_type, vertex_count)",
+)
+
+def open_library():
+    """Open the geometry library once, tuned for bulk inserts.
+
+    Autocommit mode (isolation_level=None): callers bracket their writes
+    with an explicit BEGIN/COMMIT.
+    """
+    conn = sqlite3.connect(LIBRARY_DB, isolation_level=None)
+    apply_library_pragmas(conn)
+    for ddl in LIBRARY_INDEXES:
+        conn.execute(ddl)
+    return conn
+
+def add_to_library(conn, geom_rows, catalog_rows):
+    """Add models to geometry library database in one deferred transaction."""
+    cursor = conn.cursor()
 
-    print(f"  Added to library: {fixture_type} ({len(vertices)} verts, {len(faces)} faces)")
+    ensure_compression_column(cursor)
+    ensure_dtype_column(cursor)
+
+    # Deferred: the write lock is taken at the first insert and held for the batch
+    cursor.execute("BEGIN DEFERRED")
+    try:
+        # Insert geometry - identical hashes are no-ops on re-runs; only rows
+        # written before normals were stored get rewritten (once)
+        cursor.executemany('''
+            INSERT INTO base_geometries
+            (geometry_hash, vertices, faces, normals, vertex_count, face_count, compression, dtype)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(geometry_hash) DO UPDATE SET
+                vertices = excluded.vertices,
+                faces = excluded.faces,
+                normals = excluded.normals,
+                compression = excluded.compression,
+                dtype = excluded.dtype
+            WHERE base_geometries.normals IS NULL
+        ''', geom_rows)
+
+        # Insert catalog entries
+        cursor.executemany('''
+            INSERT OR REPLACE INTO fixture_catalog
+            (geometry_hash, ifc_class, fixture_type, fixture_name, vertex_count, face_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', catalog_rows)
+
+        cursor.execute("COMMIT")
+    except BaseException:
+        cursor.execute("ROLLBACK")
+        raise
+
+def build_fixture(gen_func, output_dir):
+    """Generate and export one fixture (runs in a worker process).
+
+    Model files are only written when output_dir is given.
+    Returns (geom_row, catalog_row) for the library insert.
+    """
+    vertices, faces, fixture_type = gen_func()
+
+    # Export to OBJ (binary PLY for large meshes - no per-vertex text formatting)
+    if output_dir is not None:
+        if len(vertices) > PLY_VERTEX_THRESHOLD:
+            export_ply_binary(vertices, faces, output_dir / f"{fixture_type}.ply")
+        else:
+            export_obj(vertices, faces, output_dir / f"{fixture_type}.obj")
+
+    return library_rows(vertices, faces, fixture_type)
 
 def main():
     """Generate all transit fixture models."""
+    parser = argparse.ArgumentParser(description="Generate transit fixture models")
+    parser.add_argument('--emit-obj', action='store_true',
+                        help=f"Also write OBJ/PLY model files to {OBJ_OUTPUT}")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("TRANSIT FIXTURE MODEL GENERATOR")
     print("=" * 60)
 
-    # Create output directory
-    OBJ_OUTPUT.mkdir(parents=True, exist_ok=True)
+    # Library refreshes only need the DB blobs; model files are opt-in
+    output_dir = OBJ_OUTPUT if args.emit_obj else None
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
 
     # Model generators
     generators = [
@@ -425,20 +623,30 @@ def main():
 
     print(f"\nGenerating {len(generators)} transit fixture models...\n")
 
-    for gen_func in generators:
-        vertices, faces, fixture_type = gen_func()
+    # Fixtures are independent and write distinct files; the library
+    # insert stays in this process (one transaction below)
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(build_fixture, generators, repeat(output_dir)))
 
-        # Export to OBJ
-        obj_path = OBJ_OUTPUT / f"{fixture_type}.obj"
-        export_obj(vertices, faces, obj_path)
+    geom_rows = [geom_row for geom_row, _ in results]
+    catalog_rows = [catalog_row for _, catalog_row in results]
+
+    # Add to library
+    if not LIBRARY_DB.exists():
+        print(f"  Warning: Library DB not found at {LIBRARY_DB}")
+    else:
+        conn = open_library()
+        add_to_library(conn, geom_rows, catalog_rows)
+        conn.close()
 
-        # Add to library
-        add_to_library(vertices, faces, fixture_type)
+        for _, _, fixture_type, _, vertex_count, face_count in catalog_rows:
+            print(f"  Added to library: {fixture_type} ({vertex_count} verts, {face_count} faces)")
 
     print("\n" + "=" * 60)
     print("MODEL GENERATION COMPLETE")
     print("=" * 60)
-    print(f"\nOBJ files: {OBJ_OUTPUT}")
+    if output_dir is not None:
+        print(f"\nOBJ files: {output_dir}")
     print(f"Library DB: {LIBRARY_DB}")
 
 if __name__ == '__main__':
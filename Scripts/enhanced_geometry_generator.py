@@ -18,9 +18,26 @@ Formula:
 import struct
 import hashlib
 import math
+from functools import lru_cache
 from typing import Tuple, List, Optional, Dict, Any
 
 
+@lru_cache(maxsize=256)
+def _packer(count: int, code: str) -> struct.Struct:
+    """Precompiled packer for `count` values of struct type `code` ('f' or 'I')."""
+    return struct.Struct(f'{count}{code}')
+
+
+def pack_vertices(vertices: List[Tuple[float, float, float]]) -> bytes:
+    """Pack vertices as float32 triplets."""
+    return _packer(len(vertices) * 3, 'f').pack(*[c for v in vertices for c in v])
+
+
+def pack_faces(faces: List[Tuple[int, int, int]]) -> bytes:
+    """Pack triangle indices as uint32 triplets."""
+    return _packer(len(faces) * 3, 'I').pack(*[i for f in faces for i in f])
+
+
 def generate_cylinder_geometry(radius: float, height: float, segments: int,
                                center_x: float, center_y: float, center_z: float,
                                unit_scale: float = 0.001) -> Tuple[bytes, bytes, bytes]:
@@ -91,8 +108,8 @@ def generate_cylinder_geometry(radius: float, height: float, segments: int,
         faces.append((center_top_idx, top_next, top_current))  # Reverse winding for top
 
     # Pack to binary format
-    vertices_blob = struct.pack(f'{len(vertices) * 3}f', *[c for v in vertices for c in v])
-    faces_blob = struct.pack(f'{len(faces) * 3}I', *[i for f in faces for i in f])
+    vertices_blob = pack_vertices(vertices)
+    faces_blob = pack_faces(faces)
     normals_blob = b''  # Skip normals for simplicity
 
     return (vertices_blob, faces_blob, normals_blob)
@@ -156,8 +173,8 @@ def generate_extruded_profile_geometry(profile_vertices_2d: List[Tuple[float, fl
         faces.append((n_profile, n_profile + i, n_profile + i + 1))
 
     # Pack to binary
-    vertices_blob = struct.pack(f'{len(vertices) * 3}f', *[c for v in vertices for c in v])
-    faces_blob = struct.pack(f'{len(faces) * 3}I', *[i for f in faces for i in f])
+    vertices_blob = pack_vertices(vertices)
+    faces_blob = pack_faces(faces)
     normals_blob = b''  # Skip normals for simplicity
 
     return (vertices_blob, faces_blob, normals_blob)
@@ -8,6 +8,7 @@ Creates a reusable geometry library with:
 - Electrical: switches, data points
 """
 
+import re
 import sqlite3
 from pathlib import Path
 import json
@@ -38,7 +39,9 @@ def create_library_db(conn):
             faces BLOB NOT NULL,
             normals BLOB,
             vertex_count INTEGER NOT NULL,
-            face_count INTEGER NOT NULL
+            face_count INTEGER NOT NULL,
+            compression TEXT,
+            dtype TEXT
         )
     ''')
 
@@ -53,7 +56,13 @@ def create_library_db(conn):
             vertex_count INTEGER,
             face_count INTEGER,
             FOREIGN KEY (geometry_hash) REFERENCES base_geometries(geometry_hash)
-        )
+        ) WITHOUT ROWID
+    ''')
+
+    # Serves the per-type smallest-model lookup in load_geometry_library
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_fixture_catalog_type
+        ON fixture_catalog(fixture_type, vertex_count)
     ''')
 
     conn.commit()
@@ -65,10 +74,6 @@ def extract_fixtures():
         print(f"ERROR: Source database not found: {SOURCE_DB}")
         return
 
-    # Connect to source
-    src_conn = sqlite3.connect(SOURCE_DB)
-    src_cursor = src_conn.cursor()
-
     # Create target
     TARGET_DB.parent.mkdir(parents=True, exist_ok=True)
     tgt_conn = sqlite3.connect(TARGET_DB)
@@ -79,70 +84,75 @@ def extract_fixtures():
     print(f"Target: {TARGET_DB}")
     print()
 
-    total_extracted = 0
+    # Copy fixture geometry blobs page-to-page inside SQLite (never through Python)
+    tgt_cursor.execute("ATTACH DATABASE ? AS src", (str(SOURCE_DB),))
+    class_params = ','.join('?' * len(FIXTURE_CLASSES))
+    tgt_cursor.execute(f'''
+        INSERT OR IGNORE INTO base_geometries
+        (geometry_hash, vertices, faces, normals, vertex_count, face_count)
+        SELECT geometry_hash, vertices, faces, normals, vertex_count, face_count
+        FROM src.base_geometries
+        WHERE geometry_hash IN (
+            SELECT eg.geometry_hash
+            FROM src.element_geometry eg
+            JOIN src.elements_meta em ON eg.guid = em.guid
+            WHERE em.ifc_class IN ({class_params})
+        )
+    ''', FIXTURE_CLASSES)
+
+    # All fixture classes in one pass (blob-free: geometries were copied above)
+    tgt_cursor.execute(f'''
+        SELECT DISTINCT
+            eg.geometry_hash,
+            em.ifc_class,
+            em.element_name,
+            bg.geometry_hash,
+            bg.vertex_count,
+            bg.face_count
+        FROM src.element_geometry eg
+        JOIN src.elements_meta em ON eg.guid = em.guid
+        LEFT JOIN src.base_geometries bg ON bg.geometry_hash = eg.geometry_hash
+        WHERE em.ifc_class IN ({class_params})
+    ''', FIXTURE_CLASSES)
+
+    # DISTINCT covers (hash, class, name); a seen set drops repeat hashes per class
+    seen = set()
+    class_counts = dict.fromkeys(FIXTURE_CLASSES, 0)
+    class_rows = {ifc_class: [] for ifc_class in FIXTURE_CLASSES}
+    for geom_hash, ifc_class, name, found_hash, v_count, f_count in tgt_cursor:
+        if (ifc_class, geom_hash) in seen:
+            continue
+        seen.add((ifc_class, geom_hash))
+        class_counts[ifc_class] += 1
+
+        # Skip geometries missing from the source
+        if found_hash is None:
+            continue
+
+        # Parse fixture type from name
+        fixture_type = parse_fixture_type(name, ifc_class)
+        fixture_name = parse_fixture_name(name)
+
+        class_rows[ifc_class].append((geom_hash, ifc_class, fixture_type, fixture_name, v_count, f_count))
+
+    catalog_rows = []
 
     for ifc_class in FIXTURE_CLASSES:
-        # Get unique geometries for this class
-        src_cursor.execute('''
-            SELECT DISTINCT
-                eg.geometry_hash,
-                em.ifc_class,
-                em.element_name
-            FROM element_geometry eg
-            JOIN elements_meta em ON eg.guid = em.guid
-            WHERE em.ifc_class = ?
-        ''', (ifc_class,))
-
-        fixtures = src_cursor.fetchall()
-
-        if not fixtures:
+        if not class_counts[ifc_class]:
             print(f"  {ifc_class}: 0 fixtures")
             continue
 
-        # Group by geometry hash to avoid duplicates
-        unique_geoms = {}
-        for geom_hash, cls, name in fixtures:
-            if geom_hash not in unique_geoms:
-                unique_geoms[geom_hash] = (cls, name)
-
-        print(f"  {ifc_class}: {len(unique_geoms)} unique geometries")
-
-        for geom_hash, (cls, name) in unique_geoms.items():
-            # Get geometry data
-            src_cursor.execute('''
-                SELECT vertices, faces, normals, vertex_count, face_count
-                FROM base_geometries
-                WHERE geometry_hash = ?
-            ''', (geom_hash,))
-
-            geom_data = src_cursor.fetchone()
-            if not geom_data:
-                continue
-
-            vertices, faces, normals, v_count, f_count = geom_data
-
-            # Parse fixture type from name
-            fixture_type = parse_fixture_type(name, cls)
-            fixture_name = parse_fixture_name(name)
-
-            # Insert geometry
-            try:
-                tgt_cursor.execute('''
-                    INSERT OR IGNORE INTO base_geometries
-                    (geometry_hash, vertices, faces, normals, vertex_count, face_count)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (geom_hash, vertices, faces, normals, v_count, f_count))
-
-                # Insert catalog entry
-                tgt_cursor.execute('''
-                    INSERT OR REPLACE INTO fixture_catalog
-                    (geometry_hash, ifc_class, fixture_type, fixture_name, vertex_count, face_count)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (geom_hash, cls, fixture_type, fixture_name, v_count, f_count))
-
-                total_extracted += 1
-            except Exception as e:
-                print(f"    Error: {e}")
+        print(f"  {ifc_class}: {class_counts[ifc_class]} unique geometries")
+        catalog_rows.extend(class_rows[ifc_class])
+
+    # Insert catalog entries (later classes win for shared geometries, as before)
+    tgt_cursor.executemany('''
+        INSERT OR REPLACE INTO fixture_catalog
+        (geometry_hash, ifc_class, fixture_type, fixture_name, vertex_count, face_count)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', catalog_rows)
+
+    total_extracted = len(catalog_rows)
 
     tgt_conn.commit()
 
@@ -162,54 +172,52 @@ def extract_fixtures():
     for row in tgt_cursor.fetchall():
         print(f"  {row[0]}: {row[1]}")
 
-    src_conn.close()
     tgt_conn.close()
 
     print(f"\nLibrary saved to: {TARGET_DB}")
 
-def parse_fixture_type(name, ifc_class):
-    """Extract fixture type from element name"""
-    name_lower = name.lower()
-
+# Fixture type rules in priority order: first rule whose keywords all occur wins
+FIXTURE_TYPE_RULES = [
     # Fire protection
-    if 'sprinkler' in name_lower:
-        if 'upright' in name_lower:
-            return 'sprinkler_upright'
-        elif 'pendent' in name_lower:
-            return 'sprinkler_pendent'
-        return 'sprinkler'
-    if 'smoke' in name_lower and 'detector' in name_lower:
-        return 'smoke_detector'
-    if 'heat' in name_lower and 'detector' in name_lower:
-        return 'heat_detector'
-    if 'break glass' in name_lower or 'emergency' in name_lower:
-        return 'break_glass'
-    if 'alarm' in name_lower and 'bell' in name_lower:
-        return 'alarm_bell'
-    if 'flashing' in name_lower:
-        return 'alarm_light'
-    if 'intercom' in name_lower:
-        return 'fireman_intercom'
+    (('sprinkler', 'upright'), 'sprinkler_upright'),
+    (('sprinkler', 'pendent'), 'sprinkler_pendent'),
+    (('sprinkler',), 'sprinkler'),
+    (('smoke', 'detector'), 'smoke_detector'),
+    (('heat', 'detector'), 'heat_detector'),
+    (('break glass',), 'break_glass'),
+    (('emergency',), 'break_glass'),
+    (('alarm', 'bell'), 'alarm_bell'),
+    (('flashing',), 'alarm_light'),
+    (('intercom',), 'fireman_intercom'),
 
     # Sanitary
-    if 'toilet' in name_lower or 'wc' in name_lower:
-        return 'toilet'
-    if 'basin' in name_lower or 'sink' in name_lower:
-        return 'basin'
-    if 'urinal' in name_lower:
-        return 'urinal'
-    if 'floor trap' in name_lower:
-        return 'floor_trap'
-    if 'bidet' in name_lower:
-        return 'bidet'
-    if 'grease' in name_lower:
-        return 'grease_trap'
+    (('toilet',), 'toilet'),
+    (('wc',), 'toilet'),
+    (('basin',), 'basin'),
+    (('sink',), 'basin'),
+    (('urinal',), 'urinal'),
+    (('floor trap',), 'floor_trap'),
+    (('bidet',), 'bidet'),
+    (('grease',), 'grease_trap'),
 
     # Electrical
-    if 'rj45' in name_lower or 'data point' in name_lower:
-        return 'data_point'
-    if 'switch' in name_lower:
-        return 'switch'
+    (('rj45',), 'data_point'),
+    (('data point',), 'data_point'),
+    (('switch',), 'switch'),
+]
+
+# One pass finds every keyword; the lookahead reports overlapping matches too
+# (no keyword is a prefix of another, so each position yields the only match)
+FIXTURE_KEYWORD_RE = re.compile('(?=(%s))' % '|'.join(
+    sorted({re.escape(k) for keywords, _ in FIXTURE_TYPE_RULES for k in keywords})))
+
+def parse_fixture_type(name, ifc_class):
+    """Extract fixture type from element name"""
+    found = set(FIXTURE_KEYWORD_RE.findall(name.lower()))
+
+    for keywords, fixture_type in FIXTURE_TYPE_RULES:
+        if found.issuperset(keywords):
+            return fixture_type
 
     # Light fixtures
     if ifc_class == 'IfcLightFixture':
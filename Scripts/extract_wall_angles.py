@@ -12,14 +12,23 @@ Usage:
     python3 extract_wall_angles.py
 """
 
+import os
 import sys
 import sqlite3
 import math
+import random
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import List, Tuple
+
+import numpy as np
 
 try:
     import ezdxf
+    from ezdxf.addons import iterdxf
 except ImportError:
     print("❌ ERROR: ezdxf not installed")
     print("Install: pip install ezdxf")
@@ -29,6 +38,16 @@ except ImportError:
 DXF_PATH = Path(__file__).parent.parent / "SourceFiles/TERMINAL1DXF/01 ARCHITECT/2. BANGUNAN TERMINAL 1.dxf"
 DB_PATH = Path(__file__).parent.parent / "Terminal1_MainBuilding_FILTERED.db"
 
+# Use worker processes for the wall geometry math above this many records
+PARALLEL_MIN_RECORDS = 50000
+
+# Wall entities on wall-related layers (ARC-WALL, DINDING, etc.), case-insensitive
+WALL_ENTITY_QUERY = 'LINE LWPOLYLINE POLYLINE INSERT[layer ? ".*(WALL|DINDING|ARC|ARCH).*"]i'
+
+# Same filter for entities streamed with iterdxf (no query() on a stream)
+WALL_ENTITY_TYPES = ['LINE', 'LWPOLYLINE', 'POLYLINE', 'INSERT']
+WALL_LAYER_RE = re.compile(r'.*(WALL|DINDING|ARC|ARCH).*', re.IGNORECASE)
+
 # Spatial filter (same as extraction)
 SPATIAL_FILTER = {
     'min_x': -1615047.11,
@@ -37,19 +56,133 @@ SPATIAL_FILTER = {
     'max_y': 309442.97
 }
 
+@dataclass
+class WallAngles:
+    """Wall centers with rotation angles and lengths (one row per unique center)"""
+    centers: np.ndarray  # (N, 2) center_x, center_y in meters
+    angles: np.ndarray   # (N,) rotation angle in radians
+    lengths: np.ndarray  # (N,) length in meters
+
+    def __len__(self) -> int:
+        return len(self.angles)
+
+    @classmethod
+    def from_lists(cls, xs: List[float], ys: List[float],
+                   angles: List[float], lengths: List[float]) -> 'WallAngles':
+        """
+        Build from per-entity lists. A repeated center keeps its first
+        position and takes its last values (like assigning into a dict).
+        """
+        centers = np.column_stack([np.asarray(xs, dtype=np.float64),
+                                   np.asarray(ys, dtype=np.float64)]).reshape(-1, 2)
+        angles = np.asarray(angles, dtype=np.float64)
+        lengths = np.asarray(lengths, dtype=np.float64)
+        if len(centers) == 0:
+            return cls(centers, angles, lengths)
+
+        _, first, inverse = np.unique(centers, axis=0, return_index=True, return_inverse=True)
+        last = np.zeros(len(first), dtype=np.intp)
+        np.maximum.at(last, inverse.reshape(-1), np.arange(len(centers)))
+
+        order = np.argsort(first)
+        return cls(centers[first[order]], angles[last[order]], lengths[last[order]])
+
 def is_within_spatial_filter(x: float, y: float) -> bool:
     """Check if point is within spatial filter bounding box"""
     return (SPATIAL_FILTER['min_x'] <= x <= SPATIAL_FILTER['max_x'] and
             SPATIAL_FILTER['min_y'] <= y <= SPATIAL_FILTER['max_y'])
 
-def calculate_angle_from_points(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
+def within_spatial_filter(points: np.ndarray) -> np.ndarray:
+    """Boolean mask of (N, 2) points inside the spatial filter bounding box"""
+    x, y = points[:, 0], points[:, 1]
+    return ((SPATIAL_FILTER['min_x'] <= x) & (x <= SPATIAL_FILTER['max_x']) &
+            (SPATIAL_FILTER['min_y'] <= y) & (y <= SPATIAL_FILTER['max_y']))
+
+# Candidate (target, wall) pairs find_closest_walls expands per block
+CANDIDATE_PAIR_BATCH = 1_000_000
+
+# Columns added to element_transforms by update_database_with_angles
+TRANSFORM_COLUMNS = [
+    ('rotation_z', 'REAL DEFAULT 0.0'),
+    ('length', 'REAL DEFAULT 1.0'),
+]
+
+# Rows shown in the "Sample of updated walls" listing
+SAMPLE_SIZE = 10
+
+# Lookup indexes used by update_database_with_angles (same names as dxf_to_database.py)
+LOOKUP_INDEXES = [
+    ('idx_element_transforms_guid', 'element_transforms', 'guid'),
+    ('idx_elements_meta_ifc_class', 'elements_meta', 'ifc_class'),
+]
+
+def ensure_lookup_indexes(cursor) -> bool:
     """
-    Calculate rotation angle from two points (in radians).
-    Returns angle from X-axis (0° = East, 90° = North)
+    Create any missing lookup index (skipped when the column already leads
+    an index, e.g. guid PRIMARY KEY). Returns True if an index was created.
     """
-    dx = p2[0] - p1[0]
-    dy = p2[1] - p1[1]
-    return math.atan2(dy, dx)
+    created = False
+    for index_name, table, column in LOOKUP_INDEXES:
+        indexes = cursor.execute(f"PRAGMA index_list({table})").fetchall()
+        leading = {cursor.execute(f"PRAGMA index_info({idx[1]})").fetchone()[2] for idx in indexes}
+        if column not in leading:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({column})")
+            created = True
+    return created
+
+def pack_wall_records(point_arrays: List[np.ndarray], rotations: List[float]):
+    """Flatten per-entity point arrays into (points, counts, rotations) for compute_wall_columns"""
+    counts = np.array([len(points) for points in point_arrays], dtype=np.intp)
+    points = np.concatenate(point_arrays) if point_arrays else np.empty((0, 2))
+    return points, counts, np.asarray(rotations, dtype=np.float64)
+
+def compute_wall_columns(points: np.ndarray, counts: np.ndarray, rotations: np.ndarray,
+                         offset_x: float, offset_y: float, unit_scale: float):
+    """
+    Wall center, angle and length for a batch of DXF wall records.
+
+    Args:
+        points: (P, 2) concatenated DXF points of all records (mm)
+        counts: (N,) points per record (INSERT records have exactly one)
+        rotations: (N,) INSERT block rotation in radians, NaN for lines/polylines
+
+    Returns:
+        (center_x, center_y, angle, length) arrays in meters / radians
+    """
+    center_x, center_y, angles, lengths = (np.empty(len(counts)) for _ in range(4))
+    if len(counts) == 0:
+        return center_x, center_y, angles, lengths
+
+    starts = np.cumsum(counts) - counts
+    is_line = np.isnan(rotations)
+
+    # Center point (apply same transformation as dxf_to_database.py)
+    raw_centers = np.add.reduceat(points, starts, axis=0) / counts[:, None]
+    center_x[:] = (raw_centers[:, 0] - offset_x) * unit_scale
+    center_y[:] = (raw_centers[:, 1] - offset_y) * unit_scale
+
+    # INSERT blocks: block rotation, length unknown (use 1m default)
+    angles[:] = rotations
+    lengths[:] = 1.0
+    if not is_line.any():
+        return center_x, center_y, angles, lengths
+
+    # One diff pass over the whole batch serves both angle and length;
+    # the segments joining consecutive records are dropped
+    segments = np.delete(np.diff(points, axis=0), starts[1:] - 1, axis=0)
+    segment_lengths = np.sqrt(segments[:, 0]**2 + segments[:, 1]**2)
+    seg_starts = (starts - np.arange(len(counts)))[is_line]
+
+    # Angle from first segment (0° = East, 90° = North), all walls in one call
+    first_segments = segments[seg_starts]
+    angles[is_line] = np.arctan2(first_segments[:, 1], first_segments[:, 0])
+
+    # Total length (sum of all segments); summed per wall with ndarray.sum()
+    # because reduceat adds in a different order and drifts in the last bit
+    totals = [wall.sum() for wall in np.split(segment_lengths, seg_starts[1:])]
+    lengths[is_line] = np.array(totals) * unit_scale
+
+    return center_x, center_y, angles, lengths
 
 def get_coordinate_offset_from_db() -> Tuple[float, float, float, float]:
     """Get coordinate normalization parameters from database"""
@@ -65,12 +198,34 @@ def get_coordinate_offset_from_db() -> Tuple[float, float, float, float]:
         print("⚠️  No coordinate metadata found, using defaults")
         return (0.0, 0.0, 0.0, 0.001)
 
-def extract_wall_angles_from_dxf() -> Dict[Tuple[float, float], Tuple[float, float]]:
+def iter_wall_entities(dxf_path: Path):
+    """
+    Yield wall entities (WALL_ENTITY_QUERY) from the DXF modelspace.
+
+    ASCII DXF files are streamed entity by entity with ezdxf's iterdxf add-on,
+    so the whole drawing is never held in memory; files iterdxf cannot index
+    (e.g. binary DXF) fall back to loading the document and querying it.
+    """
+    try:
+        stream = iterdxf.opendxf(str(dxf_path))
+    except ezdxf.DXFStructureError:
+        doc = ezdxf.readfile(str(dxf_path))
+        yield from doc.modelspace().query(WALL_ENTITY_QUERY)
+        return
+
+    try:
+        for entity in stream.modelspace(types=WALL_ENTITY_TYPES):
+            if WALL_LAYER_RE.match(entity.dxf.layer):
+                yield entity
+    finally:
+        stream.close()
+
+def extract_wall_angles_from_dxf() -> WallAngles:
     """
     Extract wall positions, rotation angles, and lengths from DXF.
 
     Returns:
-        Dict mapping (center_x, center_y) → (rotation_angle_radians, length_meters)
+        WallAngles with (center_x, center_y) → (rotation_angle_radians, length_meters)
     """
     print("\n" + "="*70)
     print("EXTRACTING WALL ANGLES FROM DXF")
@@ -83,104 +238,82 @@ def extract_wall_angles_from_dxf() -> Dict[Tuple[float, float], Tuple[float, flo
     print(f"  Unit scale: {unit_scale} (mm to m)\n")
 
     print(f"Reading DXF: {DXF_PATH.name}")
-    doc = ezdxf.readfile(str(DXF_PATH))
-    msp = doc.modelspace()
-
-    wall_angles = {}
-    processed_entities = 0
-
-    # Look for entities on wall layers (ARC-WALL, etc.)
-    wall_layer_patterns = ['WALL', 'DINDING', 'ARC', 'ARCH']
-
-    for entity in msp:
-        layer = entity.dxf.layer.upper()
-
-        # Skip if not a wall-related layer
-        if not any(pattern in layer for pattern in wall_layer_patterns):
-            continue
+    # Raw wall records in entity order: in-filter points, and the block
+    # rotation for INSERTs (NaN for lines/polylines)
+    point_arrays, rotations = [], []
 
+    # Entity type and layer are filtered before anything reaches this loop
+    for entity in iter_wall_entities(DXF_PATH):
         # Extract geometry based on entity type
         points = []
+        dxftype = entity.dxftype()
 
-        if entity.dxftype() == 'LINE':
+        if dxftype == 'LINE':
             start = entity.dxf.start
             end = entity.dxf.end
             if is_within_spatial_filter(start.x, start.y):
-                points = [(start.x, start.y), (end.x, end.y)]
+                points = np.array([(start.x, start.y), (end.x, end.y)], dtype=np.float64)
 
-        elif entity.dxftype() == 'POLYLINE':
-            for vertex in entity.vertices:
-                if hasattr(vertex, 'dxf') and hasattr(vertex.dxf, 'location'):
-                    loc = vertex.dxf.location
-                    if is_within_spatial_filter(loc.x, loc.y):
-                        points.append((loc.x, loc.y))
+        elif dxftype == 'POLYLINE':
+            locations = [vertex.dxf.location for vertex in entity.vertices
+                         if hasattr(vertex, 'dxf') and hasattr(vertex.dxf, 'location')]
+            points = np.array([(loc.x, loc.y) for loc in locations], dtype=np.float64).reshape(-1, 2)
+            points = points[within_spatial_filter(points)]
 
-        elif entity.dxftype() == 'LWPOLYLINE':
-            for point in entity.get_points('xy'):
-                if is_within_spatial_filter(point[0], point[1]):
-                    points.append((point[0], point[1]))
+        elif dxftype == 'LWPOLYLINE':
+            points = np.array(entity.get_points('xy'), dtype=np.float64).reshape(-1, 2)
+            points = points[within_spatial_filter(points)]
 
-        elif entity.dxftype() == 'INSERT':
+        elif dxftype == 'INSERT':
             # Block insert - use insertion point
             insert_point = entity.dxf.insert
             if is_within_spatial_filter(insert_point.x, insert_point.y):
                 # Use block rotation if available
                 rotation_deg = getattr(entity.dxf, 'rotation', 0.0)
-                rotation_rad = math.radians(rotation_deg)
-
-                # Apply coordinate normalization
-                center_x = (insert_point.x - offset_x) * unit_scale
-                center_y = (insert_point.y - offset_y) * unit_scale
+                point_arrays.append(np.array([(insert_point.x, insert_point.y)], dtype=np.float64))
+                rotations.append(math.radians(rotation_deg))
 
-                # For INSERT blocks, length is unknown (use 1m default)
-                wall_angles[(center_x, center_y)] = (rotation_rad, 1.0)
-                processed_entities += 1
-
-        # Process line/polyline points
+        # Line/polyline needs at least one segment
         if len(points) >= 2:
-            # Calculate angle from first segment
-            angle = calculate_angle_from_points(points[0], points[1])
-
-            # Calculate total length (sum of all segments)
-            total_length = 0.0
-            for i in range(len(points) - 1):
-                dx = points[i+1][0] - points[i][0]
-                dy = points[i+1][1] - points[i][1]
-                segment_length = math.sqrt(dx**2 + dy**2)
-                total_length += segment_length
-
-            # Convert length to meters (apply unit_scale)
-            length_m = total_length * unit_scale
-
-            # Calculate center point (apply same transformation as DB extraction)
-            raw_center_x = sum(p[0] for p in points) / len(points)
-            raw_center_y = sum(p[1] for p in points) / len(points)
-
-            # Apply coordinate normalization (same as dxf_to_database.py)
-            center_x = (raw_center_x - offset_x) * unit_scale
-            center_y = (raw_center_y - offset_y) * unit_scale
+            point_arrays.append(points)
+            rotations.append(math.nan)
+
+    processed_entities = len(point_arrays)
+
+    # Geometry math runs per chunk of records; large drawings use all cores
+    if processed_entities >= PARALLEL_MIN_RECORDS:
+        bounds = np.linspace(0, processed_entities, (os.cpu_count() or 1) + 1).astype(int)
+        chunks = [pack_wall_records(point_arrays[lo:hi], rotations[lo:hi])
+                  for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+        with ProcessPoolExecutor() as executor:
+            parts = list(executor.map(compute_wall_columns, *zip(*chunks),
+                                      repeat(offset_x), repeat(offset_y), repeat(unit_scale)))
+        xs, ys, angles, lengths = (np.concatenate(column) for column in zip(*parts))
+    else:
+        xs, ys, angles, lengths = compute_wall_columns(*pack_wall_records(point_arrays, rotations),
+                                                       offset_x, offset_y, unit_scale)
 
-            wall_angles[(center_x, center_y)] = (angle, length_m)
-            processed_entities += 1
+    wall_angles = WallAngles.from_lists(xs, ys, angles, lengths)
 
     print(f"✅ Processed {processed_entities:,} wall entities")
     print(f"✅ Extracted {len(wall_angles):,} unique wall positions with angles\n")
 
     # Show angle and length distribution
-    angle_deg_list = [math.degrees(a) % 360 for (a, _) in wall_angles.values()]
-    length_list = [length for (_, length) in wall_angles.values()]
+    angle_deg = np.degrees(wall_angles.angles) % 360
+    lengths = wall_angles.lengths
 
-    if angle_deg_list:
+    if len(angle_deg):
         print("Angle distribution (degrees):")
-        print(f"  Min: {min(angle_deg_list):.1f}°")
-        print(f"  Max: {max(angle_deg_list):.1f}°")
-        print(f"  Mean: {sum(angle_deg_list)/len(angle_deg_list):.1f}°")
+        print(f"  Min: {angle_deg.min():.1f}°")
+        print(f"  Max: {angle_deg.max():.1f}°")
+        print(f"  Mean: {angle_deg.mean():.1f}°")
 
-        # Count angles in 45° bins
-        bins = {0: 0, 45: 0, 90: 0, 135: 0, 180: 0, 225: 0, 270: 0, 315: 0}
-        for angle in angle_deg_list:
-            bin_key = min(bins.keys(), key=lambda k: abs(angle - k))
-            bins[bin_key] += 1
+        # Count angles in 45° bins: nearest of 0..315 (ties go to the lower
+        # bin, and 337.5°+ counts as 315° - the bins do not wrap around)
+        lower = np.clip(angle_deg // 45, 0, 7)
+        upper = np.minimum(lower + 1, 7)
+        nearest = np.where(np.abs(angle_deg - lower * 45) <= np.abs(angle_deg - upper * 45), lower, upper)
+        bins = dict(zip(range(0, 360, 45), np.bincount(nearest.astype(int), minlength=8).tolist()))
 
         print("\n  Direction bins:")
         for deg, count in sorted(bins.items()):
@@ -188,40 +321,91 @@ def extract_wall_angles_from_dxf() -> Dict[Tuple[float, float], Tuple[float, flo
                 bar = "█" * (count // 5 or 1)
                 print(f"    {deg:3d}°: {count:4d} walls {bar}")
 
-    if length_list:
+    if len(lengths):
         print(f"\nLength distribution (meters):")
-        print(f"  Min: {min(length_list):.2f}m")
-        print(f"  Max: {max(length_list):.2f}m")
-        print(f"  Mean: {sum(length_list)/len(length_list):.2f}m")
-        print(f"  Total: {sum(length_list):.2f}m")
+        print(f"  Min: {lengths.min():.2f}m")
+        print(f"  Max: {lengths.max():.2f}m")
+        print(f"  Mean: {lengths.mean():.2f}m")
+        print(f"  Total: {lengths.sum():.2f}m")
 
     return wall_angles
 
-def find_closest_wall(wall_angles: Dict, target_x: float, target_y: float,
-                     max_distance: float = 2.0) -> Optional[Tuple[float, float]]:
+def find_closest_walls(centers: np.ndarray, targets: np.ndarray,
+                       max_distance: float = 2.0) -> np.ndarray:
     """
-    Find the closest wall angle and length to a given position.
+    Find the closest wall to each target position, for all targets at once.
 
     Args:
-        wall_angles: Dict of (x, y) → (angle, length)
-        target_x, target_y: Target position (meters)
+        centers: (M, 2) wall center positions (meters)
+        targets: (N, 2) target positions (meters)
         max_distance: Maximum search radius (meters)
 
     Returns:
-        (rotation_angle_radians, length_meters), or None if no match found
+        (N,) index into centers of the closest wall, or -1 if none within range.
+        Ties go to the lower wall index, like a linear scan.
     """
-    best_distance = max_distance
-    best_data = None
-
-    for (wx, wy), (angle, length) in wall_angles.items():
-        distance = math.sqrt((wx - target_x)**2 + (wy - target_y)**2)
-        if distance < best_distance:
-            best_distance = distance
-            best_data = (angle, length)
-
-    return best_data
-
-def update_database_with_angles(wall_angles: Dict):
+    closest = np.full(len(targets), -1, dtype=np.intp)
+    if len(centers) == 0 or len(targets) == 0:
+        return closest
+
+    # Spatial hash: walls bucketed into max_distance cells, sorted by cell key
+    # (row-major, with a spare row/column around the walls' cell range)
+    wall_cells = np.floor(centers / max_distance).astype(np.int64)
+    cell_min = wall_cells.min(axis=0) - 1
+    cell_span = wall_cells.max(axis=0) - cell_min + 2
+    wall_cells -= cell_min
+    wall_keys = wall_cells[:, 0] * cell_span[1] + wall_cells[:, 1]
+    order = np.argsort(wall_keys, kind='stable')
+    sorted_keys = wall_keys[order]
+
+    # Any wall within max_distance lies in the 3x3 cells around the target:
+    # one contiguous key range per neighbouring column (cell_x - 1 .. cell_x + 1)
+    target_cells = np.floor(targets / max_distance).astype(np.int64) - cell_min
+    query_target = np.repeat(np.arange(len(targets)), 3)
+    column = np.repeat(target_cells[:, 0], 3) + np.tile([-1, 0, 1], len(targets))
+    row = np.repeat(target_cells[:, 1], 3)
+    in_grid = (column >= 0) & (column < cell_span[0]) & (row >= 0) & (row < cell_span[1])
+    column_start = column * cell_span[1]
+    lo = np.searchsorted(sorted_keys, column_start + np.maximum(row - 1, 0), side='left')
+    hi = np.searchsorted(sorted_keys, column_start + np.minimum(row + 1, cell_span[1] - 1), side='right')
+    hi = np.where(in_grid, hi, lo)
+
+    # Expand (target, wall-in-cell) candidate pairs a block of queries at a
+    # time, so dense areas cannot blow up memory
+    counts = hi - lo
+    pair_ends = np.cumsum(counts)
+    start = 0
+    while start < len(counts):
+        block_base = pair_ends[start] - counts[start]
+        stop = int(np.searchsorted(pair_ends, block_base + CANDIDATE_PAIR_BATCH, side='right'))
+        # Whole targets per block (3 queries each), so each target is decided once
+        stop = max(-(-stop // 3) * 3, start + 3)
+        block = slice(start, stop)
+
+        target_idx = np.repeat(query_target[block], counts[block])
+        pair_start = pair_ends[block] - counts[block] - block_base
+        band_start = np.repeat(lo[block] - pair_start, counts[block])
+        wall_idx = order[band_start + np.arange(len(target_idx))]
+
+        dx = centers[wall_idx, 0] - targets[target_idx, 0]
+        dy = centers[wall_idx, 1] - targets[target_idx, 1]
+        distance = np.sqrt(dx**2 + dy**2)
+
+        within = distance < max_distance
+        target_idx, wall_idx, distance = target_idx[within], wall_idx[within], distance[within]
+
+        # Nearest wall per target (lowest index on ties)
+        pick = np.lexsort((wall_idx, distance, target_idx))
+        target_idx, wall_idx = target_idx[pick], wall_idx[pick]
+        first = np.ones(len(target_idx), dtype=bool)
+        first[1:] = target_idx[1:] != target_idx[:-1]
+        closest[target_idx[first]] = wall_idx[first]
+
+        start = stop
+
+    return closest
+
+def update_database_with_angles(wall_angles: WallAngles):
     """
     Update element_transforms table with rotation_z and length columns.
     Match walls by proximity to DXF wall positions.
@@ -232,25 +416,26 @@ def update_database_with_angles(wall_angles: Dict):
 
     conn = sqlite3.connect(str(DB_PATH))
     cursor = conn.cursor()
+    cursor.executescript("""
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        PRAGMA temp_store = MEMORY;
+    """)
 
     # Step 1: Add rotation_z and length columns if they don't exist
-    try:
-        cursor.execute("ALTER TABLE element_transforms ADD COLUMN rotation_z REAL DEFAULT 0.0")
-        print("✅ Added rotation_z column to element_transforms")
-    except sqlite3.OperationalError as e:
-        if "duplicate column" in str(e).lower():
-            print("✅ rotation_z column already exists")
+    cursor.execute("PRAGMA table_info(element_transforms)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    for column, decl in TRANSFORM_COLUMNS:
+        if column in existing_columns:
+            print(f"✅ {column} column already exists")
         else:
-            raise
+            cursor.execute(f"ALTER TABLE element_transforms ADD COLUMN {column} {decl}")
+            print(f"✅ Added {column} column to element_transforms")
 
-    try:
-        cursor.execute("ALTER TABLE element_transforms ADD COLUMN length REAL DEFAULT 1.0")
-        print("✅ Added length column to element_transforms")
-    except sqlite3.OperationalError as e:
-        if "duplicate column" in str(e).lower():
-            print("✅ length column already exists")
-        else:
-            raise
+    # Index guid / ifc_class so the lookups below are B-tree searches, not scans
+    if ensure_lookup_indexes(cursor):
+        cursor.execute("ANALYZE")
+        print("✅ Created lookup indexes")
 
     # Step 2: Get all walls from database
     cursor.execute("""
@@ -265,25 +450,44 @@ def update_database_with_angles(wall_angles: Dict):
     print(f"Found {len(elements):,} wall/door/window elements to update\n")
 
     # Step 3: Match elements to DXF walls and update rotation & length
-    matched = 0
-    unmatched = 0
-
-    for guid, cx, cy, ifc_class in elements:
-        # Find closest wall data (angle and length)
-        wall_data = find_closest_wall(wall_angles, cx, cy, max_distance=2.0)
-
-        if wall_data is not None:
-            angle, length = wall_data
-            cursor.execute("""
-                UPDATE element_transforms
-                SET rotation_z = ?, length = ?
-                WHERE guid = ?
-            """, (angle, length, guid))
-            matched += 1
-        else:
-            # Keep defaults (0.0 rotation, 1.0m length)
-            unmatched += 1
-
+    # Closest wall data (angle and length) for every element in one batched search
+    targets = np.array([(cx, cy) for _, cx, cy, _ in elements], dtype=np.float64).reshape(-1, 2)
+    closest = find_closest_walls(wall_angles.centers, targets, max_distance=2.0)
+
+    # Unmatched elements keep defaults (0.0 rotation, 1.0m length)
+    found = closest >= 0
+    matched = int(found.sum())
+    unmatched = len(elements) - matched
+
+    guids = [guid for (guid, _, _, _), hit in zip(elements, found.tolist()) if hit]
+    updates = list(zip(wall_angles.angles[closest[found]].tolist(),
+                       wall_angles.lengths[closest[found]].tolist(),
+                       guids))
+
+    # Stage the matches in a temp table, then apply them with one UPDATE
+    # (REPLACE keeps the last match for a repeated guid, as row-by-row did);
+    # IMMEDIATE takes the write lock up front so the batch cannot hit BUSY midway
+    cursor.execute("BEGIN IMMEDIATE")
+    cursor.execute("""
+        CREATE TEMP TABLE wall_updates (
+            guid TEXT PRIMARY KEY,
+            rotation_z REAL,
+            length REAL
+        )
+    """)
+    cursor.executemany("""
+        INSERT OR REPLACE INTO wall_updates (rotation_z, length, guid)
+        VALUES (?, ?, ?)
+    """, updates)
+    cursor.execute("""
+        UPDATE element_transforms
+        SET (rotation_z, length) = (
+            SELECT w.rotation_z, w.length FROM wall_updates w
+            WHERE w.guid = element_transforms.guid
+        )
+        WHERE guid IN (SELECT guid FROM wall_updates)
+    """)
+    cursor.execute("DROP TABLE wall_updates")
     conn.commit()
 
     # Step 4: Verify updates
@@ -309,16 +513,23 @@ def update_database_with_angles(wall_angles: Dict):
     print(f"✅ Length range: {min_len:.2f}m - {max_len:.2f}m (avg: {avg_len:.2f}m)")
 
     # Show sample of updated data
+    # (rowids sampled in Python; ORDER BY RANDOM() would sort every matching row)
     print("\nSample of updated walls (with rotation & length):")
     cursor.execute("""
-        SELECT m.ifc_class, t.center_x, t.center_y, t.rotation_z, t.length
+        SELECT t.rowid
         FROM elements_meta m
         JOIN element_transforms t ON m.guid = t.guid
         WHERE m.ifc_class = 'IfcWall'
         AND t.rotation_z != 0
-        ORDER BY RANDOM()
-        LIMIT 10
     """)
+    rowids = [row[0] for row in cursor.fetchall()]
+    sample = random.sample(rowids, min(SAMPLE_SIZE, len(rowids)))
+    cursor.execute(f"""
+        SELECT m.ifc_class, t.center_x, t.center_y, t.rotation_z, t.length
+        FROM elements_meta m
+        JOIN element_transforms t ON m.guid = t.guid
+        WHERE t.rowid IN ({','.join('?' * len(sample))})
+    """, sample)
 
     print(f"{'IFC Class':<20} {'Position (X, Y)':<25} {'Rotation':<12} {'Length'}")
     print("-"*75)
@@ -14,11 +14,18 @@ Example:
         "/home/red1/Documents/bonsai/8_IFC/enhanced_federation.db"
 """
 
+import re
 import sys
 import sqlite3
 import ezdxf
+from ezdxf.addons import iterdxf
+import numpy as np
 from pathlib import Path
-from collections import defaultdict
+
+# Focus on building geometry layers (case-insensitive substring match)
+BUILDING_LAYERS = ['wall', 'WALL', 'WALL1', 'window', 'WIN', 'door', 'DOOR',
+                   'column', 'COL', 'staircase', 'STAIR']
+BUILDING_LAYER_RE = re.compile('|'.join(re.escape(bl) for bl in BUILDING_LAYERS), re.IGNORECASE)
 
 
 def get_ifc_building_size(ifc_db_path):
@@ -47,22 +54,34 @@ def get_ifc_building_size(ifc_db_path):
     return width, depth
 
 
-def analyze_dxf_density(dxf_path, grid_size_mm=50000):
-    """Find densest region in DXF file using grid analysis."""
-    doc = ezdxf.readfile(dxf_path)
-    modelspace = doc.modelspace()
+def iter_modelspace(dxf_path):
+    """
+    Yield DXF modelspace entities, streamed with iterdxf when possible.
 
-    # Focus on building geometry layers
-    building_layers = ['wall', 'WALL', 'WALL1', 'window', 'WIN', 'door', 'DOOR',
-                       'column', 'COL', 'staircase', 'STAIR']
+    Falls back to loading the whole document for files iterdxf cannot
+    index (e.g. binary DXF).
+    """
+    try:
+        stream = iterdxf.opendxf(str(dxf_path))
+    except ezdxf.DXFStructureError:
+        yield from ezdxf.readfile(dxf_path).modelspace()
+        return
+
+    try:
+        yield from stream.modelspace()
+    finally:
+        stream.close()
 
+
+def analyze_dxf_density(dxf_path, grid_size_mm=50000):
+    """Find densest region in DXF file using grid analysis."""
     # Collect coordinates from geometric entities
     coords = []
 
-    for entity in modelspace:
+    for entity in iter_modelspace(dxf_path):
         # Filter to building layers
         layer = entity.dxf.layer if hasattr(entity.dxf, 'layer') else 'UNKNOWN'
-        if not any(bl.lower() in layer.lower() for bl in building_layers):
+        if not BUILDING_LAYER_RE.search(layer):
             continue
 
         # Extract coordinates
@@ -80,27 +99,23 @@ def analyze_dxf_density(dxf_path, grid_size_mm=50000):
 
     print(f"📊 Sampled {len(coords):,} geometric coordinates")
 
-    # Grid analysis
-    cells = defaultdict(lambda: {'count': 0, 'xs': [], 'ys': []})
-
-    for x, y in coords:
-        cell_x = int(x / grid_size_mm)
-        cell_y = int(y / grid_size_mm)
-        cell_key = (cell_x, cell_y)
-
-        cells[cell_key]['count'] += 1
-        cells[cell_key]['xs'].append(x)
-        cells[cell_key]['ys'].append(y)
+    # Grid analysis: cell index per coordinate (int() truncates toward zero)
+    points = np.asarray(coords, dtype=np.float64)
+    cell_index = np.trunc(points / grid_size_mm).astype(np.int64)
+    cell_keys, first_seen, cell_of_point, counts = np.unique(
+        cell_index, axis=0, return_index=True, return_inverse=True, return_counts=True)
 
-    # Find densest cell
-    densest_cell = max(cells.items(), key=lambda x: x[1]['count'])
-    cell_key, cell_data = densest_cell
+    # Find densest cell (ties go to the cell seen first)
+    densest = np.flatnonzero(counts == counts.max())
+    densest = densest[np.argmin(first_seen[densest])]
+    cell_key = tuple(cell_keys[densest].tolist())
+    cell_points = points[cell_of_point.reshape(-1) == densest]
 
-    print(f"\n🎯 Densest region: Cell {cell_key} with {cell_data['count']:,} entities")
+    print(f"\n🎯 Densest region: Cell {cell_key} with {len(cell_points):,} entities")
 
     # Calculate center of densest region
-    center_x = sum(cell_data['xs']) / len(cell_data['xs'])
-    center_y = sum(cell_data['ys']) / len(cell_data['ys'])
+    center_x = sum(cell_points[:, 0].tolist()) / len(cell_points)
+    center_y = sum(cell_points[:, 1].tolist()) / len(cell_points)
 
     return center_x, center_y
 
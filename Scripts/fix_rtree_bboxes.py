@@ -14,29 +14,36 @@ This script:
 Expected result: Preview mode shows proper element shapes/sizes
 """
 
+import os
 import sqlite3
-import struct
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
+
+
+# Rows per executemany call when staging rtree bboxes (all in one transaction)
+UPDATE_BATCH_SIZE = 2000
+
+# Geometry rows fetched and processed per chunk
+BBOX_CHUNK_SIZE = 500
+
+# Compute bboxes in worker processes from this many elements
+PARALLEL_MIN_ELEMENTS = 20000
+
 
 def unpack_vertices(blob):
     """
-    Unpack binary vertex data to list of (x, y, z) tuples.
+    Unpack binary vertex data to an (N, 3) float32 array.
     Format: Little-endian floats, 3 per vertex (12 bytes each)
     """
     if not blob:
-        return []
-
-    num_floats = len(blob) // 4
-    vertices = []
+        return np.empty((0, 3), dtype='<f4')
 
-    for i in range(0, num_floats, 3):
-        offset = i * 4
-        x, y, z = struct.unpack('<fff', blob[offset:offset+12])
-        vertices.append((x, y, z))
-
-    return vertices
+    # Whole floats only: a partial trailing float is ignored
+    return np.frombuffer(blob, dtype='<f4', count=len(blob) // 4).reshape(-1, 3)
 
 
 def calculate_bbox(vertices):
@@ -45,21 +52,69 @@ def calculate_bbox(vertices):
 
     Returns: (minX, maxX, minY, maxY, minZ, maxZ)
     """
-    if not vertices:
+    if len(vertices) == 0:
         # Fallback to 1m cube if no vertices
         return (-0.5, 0.5, -0.5, 0.5, -0.5, 0.5)
 
-    xs = [v[0] for v in vertices]
-    ys = [v[1] for v in vertices]
-    zs = [v[2] for v in vertices]
+    # Per-axis min/max in one pass each (as Python floats for sqlite3)
+    mins = vertices.min(axis=0).tolist()
+    maxs = vertices.max(axis=0).tolist()
 
     return (
-        min(xs), max(xs),
-        min(ys), max(ys),
-        min(zs), max(zs)
+        mins[0], maxs[0],
+        mins[1], maxs[1],
+        mins[2], maxs[2]
     )
 
 
+def compute_bbox_result(vertices_blob):
+    """
+    Bounding box for one vertex BLOB (runs in worker processes).
+
+    Returns: ('ok', bbox), ('empty', None) or ('error', message)
+    """
+    try:
+        vertices = unpack_vertices(vertices_blob)
+        if len(vertices) == 0:
+            return ('empty', None)
+        return ('ok', calculate_bbox(vertices))
+    except Exception as e:
+        return ('error', str(e))
+
+
+def compute_bbox_chunk(vertices_blobs):
+    """compute_bbox_result for a chunk of BLOBs (one task per chunk keeps IPC low)."""
+    return [compute_bbox_result(blob) for blob in vertices_blobs]
+
+
+def iter_bbox_results(cursor, element_count):
+    """
+    Yield ((id, guid, ifc_class), result) for each row of the geometry query, in order.
+
+    Large models fan chunks out to worker processes, with a bounded number of
+    chunks in flight so BLOBs are still streamed rather than all held at once.
+    """
+    chunks = iter(lambda: cursor.fetchmany(BBOX_CHUNK_SIZE), [])
+
+    if element_count < PARALLEL_MIN_ELEMENTS:
+        for rows in chunks:
+            yield from zip([row[:3] for row in rows], compute_bbox_chunk([row[3] for row in rows]))
+        return
+
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for rows in chunks:
+            pending.append(([row[:3] for row in rows],
+                            executor.submit(compute_bbox_chunk, [row[3] for row in rows])))
+            if len(pending) >= 2 * workers:
+                metas, future = pending.popleft()
+                yield from zip(metas, future.result())
+        while pending:
+            metas, future = pending.popleft()
+            yield from zip(metas, future.result())
+
+
 def fix_rtree_bboxes(db_path):
     """
     Recalculate and update rtree bounding boxes from actual geometry.
@@ -71,87 +126,112 @@ def fix_rtree_bboxes(db_path):
 
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
+    cursor.executescript("""
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        PRAGMA temp_store = MEMORY;
+    """)
 
-    # Get all elements with geometry
+    # Count elements with geometry (blob-free, so rows can be streamed below)
     print("Reading geometry data...")
     cursor.execute("""
-        SELECT
-            m.id,
-            m.guid,
-            m.ifc_class,
-            bg.vertices
+        SELECT COUNT(*)
         FROM elements_meta m
         JOIN base_geometries bg ON m.guid = bg.guid
-        ORDER BY m.id
     """)
 
-    elements = cursor.fetchall()
-    print(f"Found {len(elements)} elements with geometry\n")
+    element_count = cursor.fetchone()[0]
+    print(f"Found {element_count} elements with geometry\n")
 
-    if not elements:
+    if not element_count:
         print("ERROR: No geometry found in base_geometries table!")
         print("Run generate_3d_geometry.py first to create geometry.")
         conn.close()
         return False
 
-    # Process each element
+    # Process elements as they are read (in parallel for large models);
+    # only the bbox floats are kept
     print("Calculating tight bounding boxes...")
     updates = []
     stats = {
-        'total': len(elements),
+        'total': element_count,
         'updated': 0,
         'failed': 0,
         'dimensions': {}
     }
 
-    for element_id, guid, ifc_class, vertices_blob in elements:
-        try:
-            # Unpack vertices
-            vertices = unpack_vertices(vertices_blob)
+    cursor.execute("""
+        SELECT
+            m.id,
+            m.guid,
+            m.ifc_class,
+            bg.vertices
+        FROM elements_meta m
+        JOIN base_geometries bg ON m.guid = bg.guid
+        ORDER BY m.id
+    """)
 
-            if not vertices:
-                print(f"  WARNING: {guid} ({ifc_class}) has no vertices!")
-                stats['failed'] += 1
-                continue
+    for (element_id, guid, ifc_class), (status, bbox) in iter_bbox_results(cursor, element_count):
+        if status == 'empty':
+            print(f"  WARNING: {guid} ({ifc_class}) has no vertices!")
+            stats['failed'] += 1
+            continue
 
-            # Calculate tight bbox
-            minX, maxX, minY, maxY, minZ, maxZ = calculate_bbox(vertices)
+        if status == 'error':
+            print(f"  ERROR processing {guid} ({ifc_class}): {bbox}")
+            stats['failed'] += 1
+            continue
 
-            # Store for batch update
-            updates.append((
-                minX, maxX, minY, maxY, minZ, maxZ,
-                element_id
-            ))
+        minX, maxX, minY, maxY, minZ, maxZ = bbox
 
-            # Track statistics
-            width = maxX - minX
-            depth = maxY - minY
-            height = maxZ - minZ
+        # Store for batch update
+        updates.append((
+            minX, maxX, minY, maxY, minZ, maxZ,
+            element_id
+        ))
 
-            key = f"{width:.2f}×{depth:.2f}×{height:.2f}"
-            if key not in stats['dimensions']:
-                stats['dimensions'][key] = {'count': 0, 'classes': set()}
-            stats['dimensions'][key]['count'] += 1
-            stats['dimensions'][key]['classes'].add(ifc_class)
+        # Track statistics
+        width = maxX - minX
+        depth = maxY - minY
+        height = maxZ - minZ
 
-            stats['updated'] += 1
+        key = f"{width:.2f}×{depth:.2f}×{height:.2f}"
+        if key not in stats['dimensions']:
+            stats['dimensions'][key] = {'count': 0, 'classes': set()}
+        stats['dimensions'][key]['count'] += 1
+        stats['dimensions'][key]['classes'].add(ifc_class)
 
-            if stats['updated'] % 100 == 0:
-                print(f"  Processed {stats['updated']}/{stats['total']} elements...")
+        stats['updated'] += 1
 
-        except Exception as e:
-            print(f"  ERROR processing {guid} ({ifc_class}): {e}")
-            stats['failed'] += 1
+        if stats['updated'] % 100 == 0:
+            print(f"  Processed {stats['updated']}/{stats['total']} elements...")
 
-    # Batch update rtree
+    # Stage bboxes in a temp table, then reload those rtree entries in bulk
+    # (one DELETE + one INSERT ... SELECT instead of an UPDATE per row)
     print(f"\nUpdating R-tree with {len(updates)} bounding boxes...")
-    cursor.executemany("""
-        UPDATE elements_rtree
-        SET minX = ?, maxX = ?,
-            minY = ?, maxY = ?,
-            minZ = ?, maxZ = ?
-        WHERE id = ?
-    """, updates)
+    cursor.execute("BEGIN IMMEDIATE")
+    cursor.execute("""
+        CREATE TEMP TABLE rtree_bboxes (
+            id INTEGER PRIMARY KEY,
+            minX REAL, maxX REAL,
+            minY REAL, maxY REAL,
+            minZ REAL, maxZ REAL
+        )
+    """)
+    for start in range(0, len(updates), UPDATE_BATCH_SIZE):
+        cursor.executemany("""
+            INSERT OR REPLACE INTO rtree_bboxes (minX, maxX, minY, maxY, minZ, maxZ, id)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, updates[start:start + UPDATE_BATCH_SIZE])
+
+    # Only entries already in the rtree are replaced (same rows an UPDATE touches)
+    cursor.execute("DELETE FROM rtree_bboxes WHERE id NOT IN (SELECT id FROM elements_rtree)")
+    cursor.execute("DELETE FROM elements_rtree WHERE id IN (SELECT id FROM rtree_bboxes)")
+    cursor.execute("""
+        INSERT INTO elements_rtree (id, minX, maxX, minY, maxY, minZ, maxZ)
+        SELECT id, minX, maxX, minY, maxY, minZ, maxZ FROM rtree_bboxes
+    """)
+    cursor.execute("DROP TABLE rtree_bboxes")
 
     conn.commit()
 
@@ -22,14 +22,19 @@ Geometry Rules:
 - Equipment: Simple boxes (default 1x1x1m)
 """
 
+import os
 import sys
 import sqlite3
-import struct
 import hashlib
 import math
 import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 # ============================================================================
 # GEOMETRY GENERATION PARAMETERS
@@ -46,6 +51,23 @@ DEFAULT_COLUMN_DIAMETER = 0.4 # 400mm
 DEFAULT_COLUMN_HEIGHT = 3.5   # 3.5m
 DEFAULT_EQUIPMENT_SIZE = 1.0  # 1m cube
 
+# Snap element rotations to this step in degrees before meshing (None = exact
+# angles). Snapping (e.g. 0.5) collapses near-identical DXF wall directions so
+# the rotation trig cache hits, at the cost of up to step/2 degrees of error.
+ROTATION_SNAP_DEG = None
+
+# dtype for placement math (rotate + translate). BLOBs are float32 either
+# way; np.float32 halves the per-batch temporaries but rounds every step, so
+# vertex bits - and world-space geometry hashes - differ from databases
+# built with the float64 default (regenerate rather than mix the two).
+PLACEMENT_DTYPE = np.float64
+
+# Elements placed, packed and hashed together per batch
+GEOMETRY_BATCH_SIZE = 1000
+
+# Build geometry batches in worker processes from this many elements
+PARALLEL_MIN_ELEMENTS = 20000
+
 # Mesh detail levels
 COLUMN_SEGMENTS = 12  # Number of segments for cylindrical columns
 BOX_SEGMENTS = 1      # Simple box (cube)
@@ -54,205 +76,237 @@ BOX_SEGMENTS = 1      # Simple box (cube)
 # GEOMETRY PACKING UTILITIES (from extract_tessellation_to_db_v2.py)
 # ============================================================================
 
-def pack_vertices(vertices: List[Tuple[float, float, float]]) -> bytes:
-    """Pack list of (x,y,z) tuples into binary BLOB."""
-    return struct.pack(f'<{len(vertices)*3}f', *[coord for v in vertices for coord in v])
+def pack_vertices(vertices: np.ndarray) -> bytes:
+    """Pack (N, 3) vertex array (or list of (x,y,z) tuples) into binary float32 BLOB."""
+    return np.asarray(vertices, dtype='<f4').tobytes()
 
-def pack_faces(faces: List[Tuple[int, int, int]]) -> bytes:
-    """Pack list of (i1,i2,i3) tuples into binary BLOB."""
-    return struct.pack(f'<{len(faces)*3}I', *[idx for face in faces for idx in face])
+def pack_faces(faces: np.ndarray) -> bytes:
+    """Pack (M, 3) face array (or list of (i1,i2,i3) tuples) into binary uint32 BLOB."""
+    return np.asarray(faces, dtype='<u4').tobytes()
 
-def pack_normals(normals: List[Tuple[float, float, float]]) -> bytes:
-    """Pack list of normal vectors into binary BLOB."""
-    return struct.pack(f'<{len(normals)*3}f', *[coord for n in normals for coord in n])
+def pack_normals(normals: np.ndarray) -> bytes:
+    """Pack (M, 3) normal array (or list of normal vectors) into binary float32 BLOB."""
+    return np.asarray(normals, dtype='<f4').tobytes()
 
 def compute_hash(vertices_blob: bytes, faces_blob: bytes) -> str:
-    """Compute SHA256 hash of geometry for deduplication."""
-    hasher = hashlib.sha256()
+    """Compute 128-bit BLAKE2b hash of geometry for deduplication (not a security use)."""
+    hasher = hashlib.blake2b(digest_size=16)
     hasher.update(vertices_blob)
     hasher.update(faces_blob)
     return hasher.hexdigest()
 
-def compute_face_normal(v0: Tuple[float, float, float],
-                       v1: Tuple[float, float, float],
-                       v2: Tuple[float, float, float]) -> Tuple[float, float, float]:
-    """Compute face normal using cross product."""
-    # Edge vectors
-    e1 = (v1[0] - v0[0], v1[1] - v0[1], v1[2] - v0[2])
-    e2 = (v2[0] - v0[0], v2[1] - v0[1], v2[2] - v0[2])
-
-    # Cross product
-    nx = e1[1] * e2[2] - e1[2] * e2[1]
-    ny = e1[2] * e2[0] - e1[0] * e2[2]
-    nz = e1[0] * e2[1] - e1[1] * e2[0]
-
-    # Normalize
-    length = math.sqrt(nx*nx + ny*ny + nz*nz)
-    if length > 0:
-        return (nx/length, ny/length, nz/length)
-    return (0, 0, 1)  # Default up normal
+def compute_face_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """
+    Compute face normals using cross product, for all faces of a mesh at once.
+
+    Args:
+        vertices: (N, 3) float64 vertex array
+        faces: (M, 3) integer array of vertex indices
+
+    Returns:
+        (M, 3) float64 array of unit normals ((0, 0, 1) for degenerate faces)
+    """
+    # Edge vectors, from one gather of the (M, 3, 3) triangle corners
+    corners = vertices[faces]
+    e1 = (corners[:, 1] - corners[:, 0]).T
+    e2 = (corners[:, 2] - corners[:, 0]).T
+
+    # Cross product (written out per component), then normalize
+    n = np.empty((len(faces), 3), dtype=np.float64)
+    n[:, 0] = e1[1] * e2[2] - e1[2] * e2[1]
+    n[:, 1] = e1[2] * e2[0] - e1[0] * e2[2]
+    n[:, 2] = e1[0] * e2[1] - e1[1] * e2[0]
+    length = np.sqrt(n[:, 0]*n[:, 0] + n[:, 1]*n[:, 1] + n[:, 2]*n[:, 2])
+    degenerate = length == 0
+    n[degenerate] = (0, 0, 1)  # Default up normal
+    length[degenerate] = 1
+    return n / length[:, None]
 
 # ============================================================================
 # GEOMETRY TRANSFORMATION UTILITIES
 # ============================================================================
 
-def rotate_vertices_z(vertices: List[Tuple[float, float, float]], angle_rad: float) -> List[Tuple[float, float, float]]:
+@lru_cache(maxsize=4096)
+def rotation_trig(angle_rad: float) -> Tuple[float, float]:
+    """(cos, sin) of a rotation angle, cached - plans reuse a handful of wall directions."""
+    return math.cos(angle_rad), math.sin(angle_rad)
+
+def snap_rotation(angle_rad: float, step_deg: float) -> float:
+    """Round a rotation angle to the nearest multiple of step_deg degrees."""
+    step = math.radians(step_deg)
+    return round(angle_rad / step) * step
+
+def transform_vertices(vertices: np.ndarray, angle_rad: float,
+                       dx: float, dy: float, dz: float) -> np.ndarray:
     """
-    Rotate vertices around Z-axis.
+    Rotate vertices around Z-axis, then translate them, in a single pass.
 
     Args:
-        vertices: List of (x, y, z) tuples
+        vertices: (N, 3) array of (x, y, z) (lists of tuples are converted)
         angle_rad: Rotation angle in radians
+        dx, dy, dz: Translation offsets
 
     Returns:
-        Rotated vertices
+        Transformed (N, 3) float64 array
     """
-    cos_a = math.cos(angle_rad)
-    sin_a = math.sin(angle_rad)
-
-    rotated = []
-    for x, y, z in vertices:
-        # Rotation matrix around Z-axis:
-        # | cos  -sin  0 |   | x |
-        # | sin   cos  0 | × | y |
-        # |  0     0   1 |   | z |
-        new_x = x * cos_a - y * sin_a
-        new_y = x * sin_a + y * cos_a
-        new_z = z
-        rotated.append((new_x, new_y, new_z))
-
-    return rotated
-
-def translate_vertices(vertices: List[Tuple[float, float, float]],
-                      dx: float, dy: float, dz: float) -> List[Tuple[float, float, float]]:
+    vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    if angle_rad == 0:
+        return translate_vertices(vertices, dx, dy, dz)
+
+    cos_a, sin_a = rotation_trig(angle_rad)
+
+    # Rotation matrix around Z-axis, plus offset:
+    # | cos  -sin  0 |   | x |   | dx |
+    # | sin   cos  0 | × | y | + | dy |
+    # |  0     0   1 |   | z |   | dz |
+    # Written out per column (not a matmul) so results match scalar math exactly
+    x, y = vertices[:, 0], vertices[:, 1]
+    transformed = np.empty_like(vertices)
+    transformed[:, 0] = x * cos_a - y * sin_a + dx
+    transformed[:, 1] = x * sin_a + y * cos_a + dy
+    transformed[:, 2] = vertices[:, 2] + dz
+
+    return transformed
+
+def translate_vertices(vertices: np.ndarray,
+                      dx: float, dy: float, dz: float) -> np.ndarray:
     """
     Translate vertices by offset.
 
     Args:
-        vertices: List of (x, y, z) tuples
+        vertices: (N, 3) array of (x, y, z) (lists of tuples are converted)
         dx, dy, dz: Translation offsets
 
     Returns:
-        Translated vertices
+        Translated (N, 3) float64 array
     """
-    return [(x + dx, y + dy, z + dz) for x, y, z in vertices]
+    return np.asarray(vertices, dtype=np.float64).reshape(-1, 3) + np.array([dx, dy, dz], dtype=np.float64)
 
 # ============================================================================
 # PARAMETRIC GEOMETRY GENERATORS
 # ============================================================================
 
+# Box corner signs (times half-dimensions, plus center) and triangles,
+# built once and shared by every box (read-only: callers get the faces array)
+_BOX_SIGNS = np.array([
+    (-1, -1, -1),  # 0: bottom-left-front
+    (+1, -1, -1),  # 1: bottom-right-front
+    (+1, +1, -1),  # 2: bottom-right-back
+    (-1, +1, -1),  # 3: bottom-left-back
+    (-1, -1, +1),  # 4: top-left-front
+    (+1, -1, +1),  # 5: top-right-front
+    (+1, +1, +1),  # 6: top-right-back
+    (-1, +1, +1),  # 7: top-left-back
+], dtype=np.float64)
+_BOX_SIGNS.flags.writeable = False
+
+# 12 triangular faces (2 per box face)
+_BOX_FACES = np.array([
+    # Bottom (z-)
+    (0, 1, 2), (0, 2, 3),
+    # Top (z+)
+    (4, 7, 6), (4, 6, 5),
+    # Front (y-)
+    (0, 4, 5), (0, 5, 1),
+    # Back (y+)
+    (2, 6, 7), (2, 7, 3),
+    # Left (x-)
+    (0, 3, 7), (0, 7, 4),
+    # Right (x+)
+    (1, 5, 6), (1, 6, 2),
+], dtype=np.uint32)
+_BOX_FACES.flags.writeable = False
+
 def generate_box_geometry(width: float, depth: float, height: float,
                          center_x: float = 0, center_y: float = 0, center_z: float = 0
-                        ) -> Tuple[List[Tuple], List[Tuple], List[Tuple]]:
+                        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Generate box geometry (walls, equipment, etc.).
 
-    Returns: (vertices, faces, normals)
-    """
-    # Calculate half-dimensions
-    hx, hy, hz = width/2, depth/2, height/2
-
-    # 8 vertices of box (centered at origin, then offset to center position)
-    vertices = [
-        (center_x - hx, center_y - hy, center_z - hz),  # 0: bottom-left-front
-        (center_x + hx, center_y - hy, center_z - hz),  # 1: bottom-right-front
-        (center_x + hx, center_y + hy, center_z - hz),  # 2: bottom-right-back
-        (center_x - hx, center_y + hy, center_z - hz),  # 3: bottom-left-back
-        (center_x - hx, center_y - hy, center_z + hz),  # 4: top-left-front
-        (center_x + hx, center_y - hy, center_z + hz),  # 5: top-right-front
-        (center_x + hx, center_y + hy, center_z + hz),  # 6: top-right-back
-        (center_x - hx, center_y + hy, center_z + hz),  # 7: top-left-back
-    ]
-
-    # 12 triangular faces (2 per box face)
-    faces = [
-        # Bottom (z-)
-        (0, 1, 2), (0, 2, 3),
-        # Top (z+)
-        (4, 7, 6), (4, 6, 5),
-        # Front (y-)
-        (0, 4, 5), (0, 5, 1),
-        # Back (y+)
-        (2, 6, 7), (2, 7, 3),
-        # Left (x-)
-        (0, 3, 7), (0, 7, 4),
-        # Right (x+)
-        (1, 5, 6), (1, 6, 2),
-    ]
-
-    # Compute normals for each face
-    normals = []
-    for face in faces:
-        v0, v1, v2 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
-        normal = compute_face_normal(v0, v1, v2)
-        normals.append(normal)
+    Returns: (vertices (8, 3) float64, faces (12, 3) uint32 read-only, normals (12, 3) float64)
+    """
+    # 8 vertices of box: half-dimensions broadcast over the corner signs,
+    # offset to center position
+    half = np.array([width/2, depth/2, height/2], dtype=np.float64)
+    vertices = _BOX_SIGNS * half + np.array([center_x, center_y, center_z], dtype=np.float64)
+
+    # Compute normals for all faces at once
+    normals = compute_face_normals(vertices, _BOX_FACES)
+
+    return vertices, _BOX_FACES, normals
+
+@lru_cache(maxsize=16)
+def unit_ring(segments: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(cos, sin) of the ring angles for a segment count, cached read-only."""
+    angle = 2 * np.pi * np.arange(segments) / segments
+    cos_a, sin_a = np.cos(angle), np.sin(angle)
+    cos_a.flags.writeable = False
+    sin_a.flags.writeable = False
+    return cos_a, sin_a
+
+@lru_cache(maxsize=16)
+def cylinder_faces(segments: int) -> np.ndarray:
+    """
+    Triangle indices of a generate_cylinder_geometry mesh, cached read-only.
 
-    return vertices, faces, normals
+    Returns: (4 * segments, 3) uint32 array - bottom cap, sides, top cap
+    """
+    # Index arrays over ring positions i and their successors
+    i = np.arange(segments, dtype=np.uint32)
+    next_i = (i + 1) % segments
+    bottom_curr, bottom_next = i + 1, next_i + 1
+    top_curr, top_next = segments + 2 + i, segments + 2 + next_i
+
+    faces = np.empty((4 * segments, 3), dtype=np.uint32)
+
+    # Bottom cap triangles
+    bottom_cap = faces[:segments]
+    bottom_cap[:, 0] = 0
+    bottom_cap[:, 1] = bottom_curr
+    bottom_cap[:, 2] = bottom_next
+
+    # Side quads (as 2 triangles each, interleaved per segment)
+    sides = faces[segments:3 * segments].reshape(segments, 6)
+    sides[:, 0] = sides[:, 3] = bottom_curr
+    sides[:, 1] = top_curr
+    sides[:, 2] = sides[:, 4] = top_next
+    sides[:, 5] = bottom_next
+
+    # Top cap triangles
+    top_cap = faces[3 * segments:]
+    top_cap[:, 0] = segments + 1
+    top_cap[:, 1] = top_next
+    top_cap[:, 2] = top_curr
+
+    faces.flags.writeable = False
+    return faces
 
 def generate_cylinder_geometry(radius: float, height: float, segments: int = 12,
                                center_x: float = 0, center_y: float = 0, center_z: float = 0
-                              ) -> Tuple[List[Tuple], List[Tuple], List[Tuple]]:
+                              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Generate cylinder geometry (columns).
 
-    Returns: (vertices, faces, normals)
+    Returns: (vertices (N, 3) float64, faces (M, 3) uint32 read-only, normals (M, 3) float64)
     """
-    vertices = []
+    # Ring angles and coordinates, shared by both caps
+    cos_a, sin_a = unit_ring(segments)
+    ring_x = center_x + radius * cos_a
+    ring_y = center_y + radius * sin_a
 
-    # Bottom cap center
-    vertices.append((center_x, center_y, center_z))
+    # Vertices: bottom cap center, bottom ring, top cap center, top ring
+    vertices = np.empty((2 * segments + 2, 3), dtype=np.float64)
+    for cap_center, z in ((0, center_z), (segments + 1, center_z + height)):
+        vertices[cap_center] = (center_x, center_y, z)
+        ring = slice(cap_center + 1, cap_center + 1 + segments)
+        vertices[ring, 0] = ring_x
+        vertices[ring, 1] = ring_y
+        vertices[ring, 2] = z
 
-    # Bottom cap vertices
-    for i in range(segments):
-        angle = 2 * math.pi * i / segments
-        x = center_x + radius * math.cos(angle)
-        y = center_y + radius * math.sin(angle)
-        vertices.append((x, y, center_z))
+    faces = cylinder_faces(segments)
 
-    # Top cap center
-    vertices.append((center_x, center_y, center_z + height))
-
-    # Top cap vertices
-    for i in range(segments):
-        angle = 2 * math.pi * i / segments
-        x = center_x + radius * math.cos(angle)
-        y = center_y + radius * math.sin(angle)
-        vertices.append((x, y, center_z + height))
-
-    # Generate faces
-    faces = []
-
-    # Bottom cap triangles
-    for i in range(segments):
-        next_i = (i + 1) % segments
-        faces.append((0, i + 1, next_i + 1))
-
-    # Side quads (as 2 triangles each)
-    for i in range(segments):
-        next_i = (i + 1) % segments
-        bottom_curr = i + 1
-        bottom_next = next_i + 1
-        top_curr = segments + 2 + i
-        top_next = segments + 2 + next_i
-
-        # Two triangles per quad
-        faces.append((bottom_curr, top_curr, top_next))
-        faces.append((bottom_curr, top_next, bottom_next))
-
-    # Top cap triangles
-    top_center = segments + 1
-    for i in range(segments):
-        next_i = (i + 1) % segments
-        curr = segments + 2 + i
-        next_v = segments + 2 + next_i
-        faces.append((top_center, next_v, curr))
-
-    # Compute normals
-    normals = []
-    for face in faces:
-        v0, v1, v2 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
-        normal = compute_face_normal(v0, v1, v2)
-        normals.append(normal)
+    # Compute normals for all faces at once
+    normals = compute_face_normals(vertices, faces)
 
     return vertices, faces, normals
 
@@ -260,65 +314,59 @@ def generate_wall_geometry(center_x: float, center_y: float, center_z: float,
                           thickness: float = DEFAULT_WALL_THICKNESS,
                           length: float = 1.0,
                           height: float = DEFAULT_WALL_HEIGHT
-                         ) -> Tuple[List[Tuple], List[Tuple], List[Tuple]]:
+                         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Generate wall geometry (extruded rectangle).
     Wall extends along X-axis, thickness along Y-axis.
     """
     return generate_box_geometry(length, thickness, height, center_x, center_y, center_z + height/2)
 
+# Door/window frame faces as quads, split into 2 triangles each
+# (same topology for every frame; read-only, shared like _BOX_FACES)
+_FRAME_QUADS = [
+    # Left border
+    (0, 1, 9, 8), (1, 2, 10, 9), (2, 3, 11, 10), (3, 0, 8, 11),
+    # Right border
+    (4, 12, 13, 5), (5, 13, 14, 6), (6, 14, 15, 7), (7, 15, 12, 4),
+    # Top border
+    (2, 6, 14, 10), (1, 5, 13, 9),
+    # Bottom border
+    (0, 8, 12, 4), (3, 7, 15, 11),
+]
+_FRAME_FACES = np.array([triangle for q in _FRAME_QUADS
+                         for triangle in ((q[0], q[1], q[2]), (q[0], q[2], q[3]))],
+                        dtype=np.uint32)
+_FRAME_FACES.flags.writeable = False
+
 def generate_door_frame_geometry(width: float, height: float, thickness: float,
-                                frame_width: float = 0.1) -> Tuple[List[Tuple], List[Tuple], List[Tuple]]:
+                                frame_width: float = 0.1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Generate door frame geometry (hollow rectangle - distinct from solid box).
     Frame consists of 4 parts: left, right, top, bottom borders.
-    Returns 16 vertices (more than box's 8) - BonsaiTester recognizes as distinct shape.
+    Returns 16 vertices (more than box's 8) - BonsaiTester recognizes as distinct shape,
+    and the shared read-only _FRAME_FACES.
     """
     hw, hh, ht = width/2, height/2, thickness/2
     fw = frame_width  # Frame border width
 
-    vertices = []
-    # Outer corners
-    vertices.extend([
+    vertices = np.array([
+        # Outer corners
         (-hw, -ht, -hh), (-hw, ht, -hh), (-hw, ht, hh), (-hw, -ht, hh),  # Left face outer
         (hw, -ht, -hh), (hw, ht, -hh), (hw, ht, hh), (hw, -ht, hh),      # Right face outer
-    ])
-    # Inner corners (hollow center)
-    vertices.extend([
+        # Inner corners (hollow center)
         (-hw+fw, -ht, -hh+fw), (-hw+fw, ht, -hh+fw), (-hw+fw, ht, hh-fw), (-hw+fw, -ht, hh-fw),  # Inner left
         (hw-fw, -ht, -hh+fw), (hw-fw, ht, -hh+fw), (hw-fw, ht, hh-fw), (hw-fw, -ht, hh-fw),      # Inner right
-    ])
-
-    # Frame faces as quads (need to convert to triangles)
-    quads = [
-        # Left border
-        (0, 1, 9, 8), (1, 2, 10, 9), (2, 3, 11, 10), (3, 0, 8, 11),
-        # Right border
-        (4, 12, 13, 5), (5, 13, 14, 6), (6, 14, 15, 7), (7, 15, 12, 4),
-        # Top border
-        (2, 6, 14, 10), (1, 5, 13, 9),
-        # Bottom border
-        (0, 8, 12, 4), (3, 7, 15, 11),
-    ]
-
-    # Convert quads to triangles (split each quad into 2 triangles)
-    faces = []
-    for quad in quads:
-        faces.append((quad[0], quad[1], quad[2]))  # First triangle
-        faces.append((quad[0], quad[2], quad[3]))  # Second triangle
-
-    # Generate normals for each face
-    normals = []
-    for face in faces:
-        v0, v1, v2 = vertices[face[0]], vertices[face[1]], vertices[face[2]]
-        normals.append(compute_face_normal(v0, v1, v2))
+    ], dtype=np.float64)
 
-    return vertices, faces, normals
+    # Generate normals for all faces at once
+    normals = compute_face_normals(vertices, _FRAME_FACES)
+
+    return vertices, _FRAME_FACES, normals
 
 def generate_door_geometry(center_x: float, center_y: float, center_z: float,
                           width: float = DEFAULT_DOOR_WIDTH,
                           height: float = DEFAULT_DOOR_HEIGHT
-                         ) -> Tuple[List[Tuple], List[Tuple], List[Tuple]]:
+                         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Generate door geometry (frame shape - 16 vertices, distinct from boxes)."""
     thickness = 0.05  # 50mm door thickness
     vertices, faces, normals = generate_door_frame_geometry(width, height, thickness, frame_width=0.08)
@@ -329,7 +377,7 @@ def generate_door_geometry(center_x: float, center_y: float, center_z: float,
 def generate_window_geometry(center_x: float, center_y: float, center_z: float,
                             width: float = DEFAULT_WINDOW_WIDTH,
                             height: float = DEFAULT_WINDOW_HEIGHT
-                           ) -> Tuple[List[Tuple], List[Tuple], List[Tuple]]:
+                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Generate window geometry (frame shape - 16 vertices, distinct from boxes)."""
     thickness = 0.1  # 100mm window thickness
     # Windows typically start 1m above floor
@@ -342,7 +390,7 @@ def generate_window_geometry(center_x: float, center_y: float, center_z: float,
 def generate_column_geometry(center_x: float, center_y: float, center_z: float,
                             diameter: float = DEFAULT_COLUMN_DIAMETER,
                             height: float = DEFAULT_COLUMN_HEIGHT
-                           ) -> Tuple[List[Tuple], List[Tuple], List[Tuple]]:
+                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Generate column geometry (cylinder)."""
     return generate_cylinder_geometry(diameter/2, height, COLUMN_SEGMENTS, center_x, center_y, center_z)
 
@@ -398,20 +446,32 @@ def add_dimension_variety(ifc_class: str, guid: str, dimensions: Optional[Dict[s
 
     return dims
 
-def generate_element_geometry(ifc_class: str, center_x: float, center_y: float, center_z: float,
-                             dimensions: Optional[Dict[str, float]] = None,
-                             guid: str = ""
-                             ) -> Optional[Tuple[List[Tuple], List[Tuple], List[Tuple]]]:
+def generate_floor_box_geometry(center_x: float, center_y: float, center_z: float,
+                                length: float, width: float, height: float
+                               ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Generate box geometry standing on center_z (equipment, generic elements)."""
+    return generate_box_geometry(length, width, height, center_x, center_y, center_z + height/2)
+
+# Shape name -> generator(center_x, center_y, center_z, *shape_params)
+SHAPE_GENERATORS = {
+    'wall': generate_wall_geometry,        # (thickness, length, height)
+    'door': generate_door_geometry,        # (width, height)
+    'window': generate_window_geometry,    # (width, height)
+    'column': generate_column_geometry,    # (diameter, height)
+    'box': generate_floor_box_geometry,    # (length, width, height)
+}
+
+def resolve_element_shape(ifc_class: str, dimensions: Optional[Dict[str, float]] = None,
+                          guid: str = "") -> Optional[Tuple[str, Tuple[float, ...]]]:
     """
-    Generate geometry for an element based on IFC class and actual dimensions.
+    Resolve an element to a shape name and clamped shape parameters.
 
     Args:
         ifc_class: IFC class name
-        center_x, center_y, center_z: Element position
         dimensions: Dict with actual dimensions from DXF (length, width, height, diameter)
         guid: Element GUID (for deterministic dimension variety)
 
-    Returns: (vertices, faces, normals) or None if unsupported
+    Returns: (shape, params) for SHAPE_GENERATORS, or None if unsupported
     """
     # Add intelligent dimension variety for visual diversity
     dims = add_dimension_variety(ifc_class, guid, dimensions)
@@ -424,7 +484,7 @@ def generate_element_geometry(ifc_class: str, center_x: float, center_y: float,
         # Clamp to reasonable ranges (0.1m to 50m)
         length = max(0.1, min(length, 50.0))
         width = max(0.1, min(width, 1.0))
-        return generate_wall_geometry(center_x, center_y, center_z, width, length, height)
+        return 'wall', (width, length, height)
 
     elif ifc_class == "IfcDoor":
         # Use actual door dimensions from DXF block, or defaults
@@ -433,7 +493,7 @@ def generate_element_geometry(ifc_class: str, center_x: float, center_y: float,
         # Clamp to reasonable ranges (0.5m to 3m)
         width = max(0.5, min(width, 3.0))
         height = max(1.8, min(height, 3.0))
-        return generate_door_geometry(center_x, center_y, center_z, width, height)
+        return 'door', (width, height)
 
     elif ifc_class == "IfcWindow":
         # Use actual window dimensions from DXF block, or defaults
@@ -442,7 +502,7 @@ def generate_element_geometry(ifc_class: str, center_x: float, center_y: float,
         # Clamp to reasonable ranges (0.3m to 5m)
         width = max(0.3, min(width, 5.0))
         height = max(0.3, min(height, 3.0))
-        return generate_window_geometry(center_x, center_y, center_z, width, height)
+        return 'window', (width, height)
 
     elif ifc_class == "IfcColumn":
         # Use actual column diameter from DXF circle, or default
@@ -450,66 +510,132 @@ def generate_element_geometry(ifc_class: str, center_x: float, center_y: float,
         height = dims.get('height', DEFAULT_COLUMN_HEIGHT)
         # Clamp to reasonable ranges (0.2m to 2m diameter)
         diameter = max(0.2, min(diameter, 2.0))
-        return generate_column_geometry(center_x, center_y, center_z, diameter, height)
+        return 'column', (diameter, height)
 
     elif ifc_class == "IfcBuildingElementProxy":
         # Generic equipment/proxy - use box with varied dimensions for visual diversity
         length = dims.get('length', DEFAULT_EQUIPMENT_SIZE)
         width = dims.get('width', DEFAULT_EQUIPMENT_SIZE)
         height = dims.get('height', DEFAULT_EQUIPMENT_SIZE)
-        return generate_box_geometry(length, width, height, center_x, center_y,
-                                    center_z + height/2)
+        return 'box', (length, width, height)
     else:
         # Other elements - simple 0.5m cube (or measured size)
         size = dims.get('length', 0.5) if dims else 0.5
         size = max(0.1, min(size, 2.0))  # Clamp
-        return generate_box_geometry(size, size, size, center_x, center_y, center_z + size/2)
+        return 'box', (size, size, size)
 
-# ============================================================================
-# DATABASE OPERATIONS
-# ============================================================================
+def generate_element_geometry(ifc_class: str, center_x: float, center_y: float, center_z: float,
+                             dimensions: Optional[Dict[str, float]] = None,
+                             guid: str = ""
+                             ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Generate geometry for an element based on IFC class and actual dimensions.
 
-def populate_geometry_tables(db_path: str, limit: Optional[int] = None):
+    Args:
+        ifc_class: IFC class name
+        center_x, center_y, center_z: Element position
+        dimensions: Dict with actual dimensions from DXF (length, width, height, diameter)
+        guid: Element GUID (for deterministic dimension variety)
+
+    Returns: (vertices, faces, normals) or None if unsupported
     """
-    Populate base_geometries table with generated 3D meshes.
+    resolved = resolve_element_shape(ifc_class, dimensions, guid)
+    if resolved is None:
+        return None
+
+    shape, params = resolved
+    return SHAPE_GENERATORS[shape](center_x, center_y, center_z, *params)
+
+@lru_cache(maxsize=4096)
+def shape_template(shape: str, params: Tuple[float, ...]) -> Tuple[np.ndarray, bytes, bytes]:
+    """
+    Mesh of a shape at the origin, unrotated, cached per (shape, params).
+
+    Elements sharing a shape (same class and clamped dimensions) reuse one
+    generated mesh and its packed faces/normals; only vertices are transformed.
+
+    Returns: (vertices (N, 3) float64 read-only array, faces_blob, normals_blob)
+    """
+    vertices, faces, normals = SHAPE_GENERATORS[shape](0, 0, 0, *params)
+    vertices.flags.writeable = False
+    return vertices, pack_faces(faces), pack_normals(normals)
+
+def place_template(shape: str, params: Tuple[float, ...], rotations: np.ndarray,
+                   centers: np.ndarray) -> List[Tuple[bytes, str]]:
+    """
+    World-space vertices BLOBs and geometry hashes for many placements of one
+    shape template, transformed together (batched transform_vertices).
 
     Args:
-        db_path: Path to database file
-        limit: Maximum elements to process (None = all)
+        shape, params: Shape template (see shape_template)
+        rotations: (K,) rotation angles in radians
+        centers: (K, 3) element positions
+
+    Returns: [(vertices_blob, geometry_hash)] per placement
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    template, faces_blob, _ = shape_template(shape, params)
+    template = template.astype(PLACEMENT_DTYPE, copy=False)
+    centers = centers.astype(PLACEMENT_DTYPE, copy=False)
+    x, y, z = template[:, 0], template[:, 1], template[:, 2]
+
+    # Placed vertices are written straight into the float32 BLOB layout: each
+    # float64 result is rounded once on assignment, as pack_vertices would
+    # (see PLACEMENT_DTYPE)
+    packed = np.empty((len(rotations), len(template), 3), dtype='<f4')
+
+    # Unrotated placements are translated only, as in transform_vertices
+    rotated = rotations != 0
+    packed[~rotated] = template + centers[~rotated, None, :]
+
+    # Rotation and translation in one pass per output column. Per-placement
+    # trig comes from the cached scalar helper, so values match
+    # transform_vertices exactly; (R, 1) columns broadcast over the vertices
+    if rotated.any():
+        trig = np.array([rotation_trig(angle) for angle in rotations[rotated].tolist()], dtype=PLACEMENT_DTYPE)
+        cos_a, sin_a = trig[:, 0:1], trig[:, 1:2]
+        offsets = centers[rotated]
+        dx, dy, dz = offsets[:, 0:1], offsets[:, 1:2], offsets[:, 2:3]
+        packed[rotated, :, 0] = x * cos_a - y * sin_a + dx
+        packed[rotated, :, 1] = x * sin_a + y * cos_a + dy
+        packed[rotated, :, 2] = z + dz
+
+    # Hash each placement's BLOB
+    vertices_blobs = [vertices.tobytes() for vertices in packed]
+    return [(blob, compute_hash(blob, faces_blob)) for blob in vertices_blobs]
+
+def build_geometry_batch(placements: List[Tuple]) -> List[Tuple[bytes, str]]:
+    """
+    Vertices BLOB and geometry hash for a batch of element placements.
 
-    # Get all elements with positions, dimensions, rotation, and extracted length
-    print("Reading elements from database...")
-    query = """
-        SELECT m.guid, m.ifc_class, m.discipline, t.center_x, t.center_y, t.center_z,
-               COALESCE(t.rotation_z, 0.0) as rotation_z, m.dimensions,
-               COALESCE(t.length, 1.0) as length
-        FROM elements_meta m
-        JOIN element_transforms t ON m.guid = t.guid
-        ORDER BY m.ifc_class, m.guid
+    Placements are (shape, params, rotation_z, center_x, center_y, center_z).
+    Repeated placements (same shape stacked at the same spot, common with
+    overlapping DXF layers) are built once, and each distinct shape is
+    transformed in one vectorized pass.
+
+    Returns: [(vertices_blob, geometry_hash)] in placement order
     """
-    if limit:
-        query += f" LIMIT {limit}"
+    groups = {}
+    for placement in dict.fromkeys(placements):
+        groups.setdefault(placement[:2], []).append(placement)
 
-    cursor.execute(query)
-    elements = cursor.fetchall()
+    built = {}
+    for (shape, params), group in groups.items():
+        poses = np.array([placement[2:] for placement in group], dtype=np.float64)
+        built.update(zip(group, place_template(shape, params, poses[:, 0], poses[:, 1:])))
 
-    print(f"Found {len(elements)} elements to process")
+    return [built[placement] for placement in placements]
 
-    # Statistics
-    stats = {
-        'total': len(elements),
-        'processed': 0,
-        'skipped': 0,
-        'by_class': {},
-        'with_dimensions': 0,
-        'without_dimensions': 0
-    }
+# ============================================================================
+# DATABASE OPERATIONS
+# ============================================================================
 
-    # Process each element
-    for guid, ifc_class, discipline, center_x, center_y, center_z, rotation_z, dimensions_json, length_from_dxf in elements:
+def iter_pending_batches(rows: Iterable[Tuple], stats: Dict) -> Iterator[List[Tuple[str, str, Tuple]]]:
+    """
+    Resolve element rows to queued (guid, ifc_class, placement) entries,
+    yielded GEOMETRY_BATCH_SIZE at a time (dimension statistics go to stats).
+    """
+    pending = []
+    for guid, ifc_class, discipline, center_x, center_y, center_z, rotation_z, dimensions_json, length_from_dxf in rows:
         # Track by class
         if ifc_class not in stats['by_class']:
             stats['by_class'][ifc_class] = 0
@@ -532,48 +658,165 @@ def populate_geometry_tables(db_path: str, limit: Optional[int] = None):
         if not dimensions:
             stats['without_dimensions'] += 1
 
-        # Generate geometry with actual dimensions (at origin, unrotated)
-        # Pass GUID for deterministic dimension variety
-        result = generate_element_geometry(ifc_class, 0, 0, 0, dimensions, guid)
+        # Resolve shape with actual dimensions (GUID gives deterministic variety),
+        # then reuse its mesh at the origin, unrotated, if already generated
+        resolved = resolve_element_shape(ifc_class, dimensions, guid)
 
-        if result is None:
+        if resolved is None:
             stats['skipped'] += 1
             continue
 
-        vertices, faces, normals = result
+        # Queue the placement (rotation + translation); meshes are placed,
+        # packed and hashed a batch at a time
+        if ROTATION_SNAP_DEG:
+            rotation_z = snap_rotation(rotation_z, ROTATION_SNAP_DEG)
+        pending.append((guid, ifc_class, (*resolved, rotation_z, center_x, center_y, center_z)))
 
-        # Apply rotation and translation to vertices
-        if rotation_z != 0:
-            vertices = rotate_vertices_z(vertices, rotation_z)
+        if len(pending) >= GEOMETRY_BATCH_SIZE:
+            yield pending
+            pending = []
 
-        # Translate to final position
-        vertices = translate_vertices(vertices, center_x, center_y, center_z)
+    if pending:
+        yield pending
+
+def iter_built_batches(batches: Iterable[List[Tuple[str, str, Tuple]]],
+                       parallel: bool) -> Iterator[Tuple[List, List[Tuple[bytes, str]]]]:
+    """
+    Yield (pending, built) for each queued batch, in order, with built from
+    build_geometry_batch.
 
-        # Pack into binary blobs
-        vertices_blob = pack_vertices(vertices)
-        faces_blob = pack_faces(faces)
-        normals_blob = pack_normals(normals)
+    In parallel mode batches go to worker processes, with a bounded number in
+    flight so rows are still streamed rather than all queued at once.
+    """
+    if not parallel:
+        for pending in batches:
+            yield pending, build_geometry_batch([placement for _, _, placement in pending])
+        return
+
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for pending in batches:
+            in_flight.append((pending, executor.submit(
+                build_geometry_batch, [placement for _, _, placement in pending])))
+            if len(in_flight) >= 2 * workers:
+                pending, future = in_flight.popleft()
+                yield pending, future.result()
+        while in_flight:
+            pending, future = in_flight.popleft()
+            yield pending, future.result()
+
+def insert_geometry_batch(cursor: sqlite3.Cursor, pending: List[Tuple[str, str, Tuple]],
+                          built: List[Tuple[bytes, str]], stats: Dict):
+    """
+    Insert built geometry (vertices_blob, geometry_hash) for queued
+    (guid, ifc_class, placement) rows into base_geometries in queue order
+    (inside the caller's transaction).
 
-        # Compute geometry hash
-        geom_hash = compute_hash(vertices_blob, faces_blob)
+    The batch goes in with one executemany; if any row fails, the batch is
+    rolled back to a savepoint and retried row by row so only failing rows
+    are skipped (and reported), as with per-row inserts.
+    """
+    # Faces/normals come packed from the shape template
+    rows = []
+    for (guid, _, placement), (vertices_blob, geom_hash) in zip(pending, built):
+        _, faces_blob, normals_blob = shape_template(*placement[:2])
+        rows.append((guid, geom_hash, vertices_blob, faces_blob, normals_blob))
+
+    # Insert/update base_geometries (replace if already exists)
+    insert_sql = """
+        INSERT OR REPLACE INTO base_geometries (guid, geometry_hash, vertices, faces, normals)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    cursor.execute("SAVEPOINT geometry_batch")
+    try:
+        cursor.executemany(insert_sql, rows)
+        row_by_row = False
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK TO geometry_batch")
+        row_by_row = True
+    cursor.execute("RELEASE geometry_batch")
+
+    for (guid, ifc_class, _), row in zip(pending, rows):
+        if row_by_row:
+            try:
+                cursor.execute(insert_sql, row)
+            except Exception as e:
+                print(f"ERROR processing {guid} ({ifc_class}): {e}")
+                stats['skipped'] += 1
+                continue
 
-        # Insert/update base_geometries (replace if already exists)
-        try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO base_geometries (guid, geometry_hash, vertices, faces, normals)
-                VALUES (?, ?, ?, ?, ?)
-            """, (guid, geom_hash, vertices_blob, faces_blob, normals_blob))
+        stats['processed'] += 1
+        stats['by_class'][ifc_class] += 1
 
-            stats['processed'] += 1
-            stats['by_class'][ifc_class] += 1
+        if stats['processed'] % 100 == 0:
+            print(f"  Processed {stats['processed']}/{stats['total']} elements...")
 
-            if stats['processed'] % 100 == 0:
-                print(f"  Processed {stats['processed']}/{len(elements)} elements...")
-                conn.commit()
+def populate_geometry_tables(db_path: str, limit: Optional[int] = None):
+    """
+    Populate base_geometries table with generated 3D meshes.
 
-        except Exception as e:
-            print(f"ERROR processing {guid} ({ifc_class}): {e}")
-            stats['skipped'] += 1
+    Args:
+        db_path: Path to database file
+        limit: Maximum elements to process (None = all)
+    """
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.executescript("""
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        PRAGMA temp_store = MEMORY;
+    """)
+
+    # All inserts go in one transaction, committed once at the end (opened
+    # first so the count below and the streamed rows see the same snapshot)
+    cursor.execute("BEGIN IMMEDIATE")
+
+    # Count elements first, so rows can be streamed from the cursor below
+    print("Reading elements from database...")
+    cursor.execute("""
+        SELECT COUNT(*)
+        FROM elements_meta m
+        JOIN element_transforms t ON m.guid = t.guid
+    """)
+    element_count = cursor.fetchone()[0]
+    if limit:
+        element_count = min(element_count, limit)
+
+    print(f"Found {element_count} elements to process")
+
+    # Get all elements with positions, dimensions, rotation, and extracted length
+    # (on their own cursor; inserts use the main one)
+    query = """
+        SELECT m.guid, m.ifc_class, m.discipline, t.center_x, t.center_y, t.center_z,
+               COALESCE(t.rotation_z, 0.0) as rotation_z, m.dimensions,
+               COALESCE(t.length, 1.0) as length
+        FROM elements_meta m
+        JOIN element_transforms t ON m.guid = t.guid
+        ORDER BY m.ifc_class, m.guid
+    """
+    if limit:
+        query += f" LIMIT {limit}"
+
+    read_cursor = conn.cursor()
+    read_cursor.execute(query)
+
+    # Statistics
+    stats = {
+        'total': element_count,
+        'processed': 0,
+        'skipped': 0,
+        'by_class': {},
+        'with_dimensions': 0,
+        'without_dimensions': 0
+    }
+
+    # Process each element as it is read; geometry is built a batch at a
+    # time (in worker processes for large models) and inserted in order
+    batches = iter_pending_batches(read_cursor, stats)
+    parallel = element_count >= PARALLEL_MIN_ELEMENTS
+    for pending, built in iter_built_batches(batches, parallel):
+        insert_geometry_batch(cursor, pending, built, stats)
 
     # Final commit
     conn.commit()
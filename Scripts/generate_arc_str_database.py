@@ -34,13 +34,15 @@ Output:
 
 import sys
 import sqlite3
-import struct
+from array import array
+from itertools import chain
 import hashlib
 import math
 import json
 import uuid
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Tuple, Dict, Optional
 
 # Import MEP generator classes
@@ -63,8 +65,9 @@ from geometry_generators import (
     ExtrudedPolylineGenerator,
     SlabGenerator,
     DomeGenerator,
-    compute_face_normal
+    compute_face_normals
 )
+from blob_compression import decompress_blob, has_compression_column, has_dtype_column, widen_mesh_blobs
 
 # ============================================================================
 # PATHS
@@ -591,10 +594,14 @@ def load_geometry_library():
     conn = sqlite3.connect(GEOMETRY_LIBRARY)
     cursor = conn.cursor()
 
+    # Libraries may store compressed or narrowed blobs (older libraries lack these columns)
+    compression_col = 'bg.compression' if has_compression_column(cursor) else 'NULL'
+    dtype_col = 'bg.dtype' if has_dtype_column(cursor) else 'NULL'
+
     # Get one geometry per fixture type (preferring smaller vertex counts for performance)
-    cursor.execute('''
+    cursor.execute(f'''
         SELECT fc.fixture_type, fc.geometry_hash, bg.vertices, bg.faces, bg.normals,
-               fc.vertex_count, fc.face_count
+               fc.vertex_count, fc.face_count, {compression_col}, {dtype_col}
         FROM fixture_catalog fc
         JOIN base_geometries bg ON fc.geometry_hash = bg.geometry_hash
         GROUP BY fc.fixture_type
@@ -602,12 +609,15 @@ def load_geometry_library():
     ''')
 
     for row in cursor.fetchall():
-        fixture_type, geom_hash, vertices, faces, normals, v_count, f_count = row
+        fixture_type, geom_hash, vertices, faces, normals, v_count, f_count, compression, dtype = row
+        # Federation blobs are always float32 vertices / int32 faces
+        vertices, faces = widen_mesh_blobs(decompress_blob(vertices, compression),
+                                           decompress_blob(faces, compression), dtype)
         library[fixture_type] = {
             'hash': geom_hash,
             'vertices': vertices,
             'faces': faces,
-            'normals': normals,
+            'normals': decompress_blob(normals, compression),
             'vertex_count': v_count,
             'face_count': f_count
         }
@@ -625,13 +635,12 @@ def transform_library_geometry(lib_geom, cx, cy, cz, scale=1.0, hanging=False):
     Args:
         hanging: If True, fixture hangs from ceiling (use max Z as reference)
     """
-    import struct
-
     vertices_blob = lib_geom['vertices']
     vertex_count = lib_geom['vertex_count']
 
-    # Unpack vertices (3 floats per vertex)
-    vertices = struct.unpack(f'{vertex_count * 3}f', vertices_blob)
+    # View vertices as a float32 buffer (3 floats per vertex) - no tuple unpacking
+    vertices = array('f')
+    vertices.frombytes(memoryview(vertices_blob)[:vertex_count * 12])
 
     # Find centroid of original geometry
     xs = vertices[0::3]
@@ -648,14 +657,15 @@ def transform_library_geometry(lib_geom, cx, cy, cz, scale=1.0, hanging=False):
         orig_cz = min(zs)
 
     # Transform: center at origin, scale, then move to world position
-    new_vertices = []
+    new_vertices = array('f')
     for i in range(vertex_count):
         x = (vertices[i*3] - orig_cx) * scale + cx
         y = (vertices[i*3 + 1] - orig_cy) * scale + cy
         z = (vertices[i*3 + 2] - orig_cz) * scale + cz
-        new_vertices.extend([x, y, z])
+        new_vertices.extend((x, y, z))
 
-    return struct.pack(f'{len(new_vertices)}f', *new_vertices)
+    # Serialize straight from the buffer (no struct.pack argument expansion)
+    return new_vertices.tobytes()
 
 # Also check for any .blend files to delete
 BLEND_OUTPUT = OUTPUT_DIR / "Terminal1_ARC_STR.blend"
@@ -665,17 +675,23 @@ BLEND_FULL_OUTPUT = OUTPUT_DIR / "Terminal1_ARC_STR_full.blend"
 # GEOMETRY UTILITIES
 # ============================================================================
 
+def _little_endian_bytes(values: array) -> bytes:
+    """BLOB bytes of an array in little-endian order (array writes native order)."""
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
 def pack_vertices(vertices: List[Tuple[float, float, float]]) -> bytes:
-    """Pack list of (x,y,z) tuples into binary BLOB."""
-    return struct.pack(f'<{len(vertices)*3}f', *[coord for v in vertices for coord in v])
+    """Pack list of (x,y,z) tuples into binary BLOB (little-endian float32 buffer, no struct.pack expansion)."""
+    return _little_endian_bytes(array('f', chain.from_iterable(vertices)))
 
 def pack_faces(faces: List[Tuple[int, int, int]]) -> bytes:
-    """Pack list of (i1,i2,i3) tuples into binary BLOB."""
-    return struct.pack(f'<{len(faces)*3}I', *[idx for face in faces for idx in face])
+    """Pack list of (i1,i2,i3) tuples into binary BLOB (little-endian uint32 buffer)."""
+    return _little_endian_bytes(array('I', chain.from_iterable(faces)))
 
 def pack_normals(normals: List[Tuple[float, float, float]]) -> bytes:
-    """Pack list of normal vectors into binary BLOB."""
-    return struct.pack(f'<{len(normals)*3}f', *[coord for n in normals for coord in n])
+    """Pack list of normal vectors into binary BLOB (little-endian float32 buffer)."""
+    return _little_endian_bytes(array('f', chain.from_iterable(normals)))
 
 def compute_hash(vertices_blob: bytes, faces_blob: bytes) -> str:
     """Compute SHA256 hash of geometry for deduplication."""
@@ -684,18 +700,6 @@ def compute_hash(vertices_blob: bytes, faces_blob: bytes) -> str:
     hasher.update(faces_blob)
     return hasher.hexdigest()
 
-def compute_face_normal(v0, v1, v2) -> Tuple[float, float, float]:
-    """Compute face normal using cross product."""
-    e1 = (v1[0] - v0[0], v1[1] - v0[1], v1[2] - v0[2])
-    e2 = (v2[0] - v0[0], v2[1] - v0[1], v2[2] - v0[2])
-    nx = e1[1] * e2[2] - e1[2] * e2[1]
-    ny = e1[2] * e2[0] - e1[0] * e2[2]
-    nz = e1[0] * e2[1] - e1[1] * e2[0]
-    length = math.sqrt(nx*nx + ny*ny + nz*nz)
-    if length > 0:
-        return (nx/length, ny/length, nz/length)
-    return (0, 0, 1)
-
 def generate_box_geometry(width: float, depth: float, height: float) -> Tuple[List, List, List]:
     """Generate box geometry centered at origin."""
     hx, hy, hz = width/2, depth/2, height/2
@@ -711,7 +715,7 @@ def generate_box_geometry(width: float, depth: float, height: float) -> Tuple[Li
         (0, 3, 7), (0, 7, 4),  # Left
         (1, 5, 6), (1, 6, 2),  # Right
     ]
-    normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+    normals = compute_face_normals(vertices, faces)
     return vertices, faces, normals
 
 def generate_box_at_position(width: float, depth: float, height: float,
@@ -730,7 +734,7 @@ def generate_box_at_position(width: float, depth: float, height: float,
         (0, 3, 7), (0, 7, 4),  # Left
         (1, 5, 6), (1, 6, 2),  # Right
     ]
-    normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+    normals = compute_face_normals(vertices, faces)
     return vertices, faces, normals
 
 def generate_oriented_box(length: float, width: float, height: float,
@@ -767,7 +771,7 @@ def generate_oriented_box(length: float, width: float, height: float,
         (0, 3, 7), (0, 7, 4),  # Left
         (1, 5, 6), (1, 6, 2),  # Right
     ]
-    normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+    normals = compute_face_normals(vertices, faces)
     return vertices, faces, normals
 
 def generate_cylinder_at_position(radius: float, height: float,
@@ -801,7 +805,7 @@ def generate_cylinder_at_position(radius: float, height: float,
         faces.append((b1, b2, t2))
         faces.append((b1, t2, t1))
 
-    normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+    normals = compute_face_normals(vertices, faces)
     return vertices, faces, normals
 
 def generate_extruded_polyline(points: List[Tuple[float, float]], thickness: float, height: float,
@@ -888,34 +892,35 @@ def generate_extruded_polyline(points: List[Tuple[float, float]], thickness: flo
     faces.append((e0, bottom_count + e0, bottom_count + e1))
     faces.append((e0, bottom_count + e1, e1))
 
-    normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+    normals = compute_face_normals(vertices, faces)
     return vertices, faces, normals
 
+@lru_cache(maxsize=16)
+def unit_ring(segments: int) -> Tuple[Tuple[float, float], ...]:
+    """(cos, sin) of each ring angle for a segment count, cached."""
+    return tuple((math.cos(2 * math.pi * i / segments), math.sin(2 * math.pi * i / segments))
+                 for i in range(segments))
+
+@lru_cache(maxsize=16)
+def cylinder_faces(segments: int) -> Tuple[Tuple[int, int, int], ...]:
+    """Triangle indices of a generate_cylinder_geometry mesh, cached per segment count."""
+    b = [(i + 1, (i + 1) % segments + 1) for i in range(segments)]  # Bottom ring (curr, next)
+    t = [(segments + 1 + b1, segments + 1 + b2) for b1, b2 in b]     # Top ring (curr, next)
+    bottom_cap = [(0, b1, b2) for b1, b2 in b]
+    sides = [face for (b1, b2), (t1, t2) in zip(b, t) for face in ((b1, t1, t2), (b1, t2, b2))]
+    top_cap = [(segments + 1, t2, t1) for t1, t2 in t]
+    return tuple(bottom_cap + sides + top_cap)
+
 def generate_cylinder_geometry(radius: float, height: float, segments: int = 12) -> Tuple[List, List, List]:
     """Generate cylinder geometry centered at origin."""
+    ring = [(radius * c, radius * s) for c, s in unit_ring(segments)]
     vertices = [(0, 0, 0)]  # Bottom center
-    for i in range(segments):
-        angle = 2 * math.pi * i / segments
-        vertices.append((radius * math.cos(angle), radius * math.sin(angle), 0))
+    vertices.extend((x, y, 0) for x, y in ring)
     vertices.append((0, 0, height))  # Top center
-    for i in range(segments):
-        angle = 2 * math.pi * i / segments
-        vertices.append((radius * math.cos(angle), radius * math.sin(angle), height))
+    vertices.extend((x, y, height) for x, y in ring)
 
-    faces = []
-    # Bottom cap
-    for i in range(segments):
-        faces.append((0, i + 1, (i + 1) % segments + 1))
-    # Sides
-    for i in range(segments):
-        b1, b2 = i + 1, (i + 1) % segments + 1
-        t1, t2 = segments + 2 + i, segments + 2 + (i + 1) % segments
-        faces.extend([(b1, t1, t2), (b1, t2, b2)])
-    # Top cap
-    for i in range(segments):
-        faces.append((segments + 1, segments + 2 + (i + 1) % segments, segments + 2 + i))
-
-    normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+    faces = list(cylinder_faces(segments))
+    normals = compute_face_normals(vertices, faces)
     return vertices, faces, normals
 
 # ============================================================================
@@ -938,12 +943,12 @@ def create_database_schema(conn: sqlite3.Connection):
             face_count INTEGER NOT NULL
         );
 
-        -- Element instances (point to base geometry)
+        -- Element instances (point to base geometry; small rows, clustered on guid)
         CREATE TABLE IF NOT EXISTS element_instances (
             guid TEXT PRIMARY KEY,
             geometry_hash TEXT NOT NULL,
             FOREIGN KEY (geometry_hash) REFERENCES base_geometries(geometry_hash)
-        );
+        ) WITHOUT ROWID;
 
         -- Element metadata
         CREATE TABLE IF NOT EXISTS elements_meta (
@@ -979,7 +984,7 @@ def create_database_schema(conn: sqlite3.Connection):
             storey TEXT,
             space TEXT,
             FOREIGN KEY (guid) REFERENCES elements_meta(guid)
-        );
+        ) WITHOUT ROWID;
 
         -- Global offset for coordinate alignment
         CREATE TABLE IF NOT EXISTS global_offset (
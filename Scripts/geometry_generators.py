@@ -54,6 +54,35 @@ def compute_face_normal(v0: Tuple, v1: Tuple, v2: Tuple) -> Tuple[float, float,
     return (0, 0, 1)
 
 
+def compute_face_normals(vertices: List[Tuple], faces: List[Tuple[int, int, int]]) -> List[Tuple[float, float, float]]:
+    """
+    Normal vector for every triangle of a mesh (compute_face_normal per face).
+
+    Same arithmetic as compute_face_normal, so results are identical; the loop
+    just skips the per-face call and edge-tuple allocations.
+    """
+    sqrt = math.sqrt
+    normals = []
+    for i0, i1, i2 in faces:
+        x0, y0, z0 = vertices[i0]
+        x1, y1, z1 = vertices[i1]
+        x2, y2, z2 = vertices[i2]
+        # Edge vectors
+        ax, ay, az = x1 - x0, y1 - y0, z1 - z0
+        bx, by, bz = x2 - x0, y2 - y0, z2 - z0
+        # Cross product
+        nx = ay * bz - az * by
+        ny = az * bx - ax * bz
+        nz = ax * by - ay * bx
+        # Normalize
+        length = sqrt(nx*nx + ny*ny + nz*nz)
+        if length > 0:
+            normals.append((nx/length, ny/length, nz/length))
+        else:
+            normals.append((0, 0, 1))
+    return normals
+
+
 # ============================================================================
 # GEOMETRY GENERATORS
 # ============================================================================
@@ -87,7 +116,7 @@ class BoxGenerator:
             (0, 3, 7), (0, 7, 4),  # Left
             (1, 5, 6), (1, 6, 2),  # Right
         ]
-        normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+        normals = compute_face_normals(vertices, faces)
         return GeometryResult(vertices, faces, normals)
 
 
@@ -133,7 +162,7 @@ class OrientedBoxGenerator:
             (0, 3, 7), (0, 7, 4),  # Left
             (1, 5, 6), (1, 6, 2),  # Right
         ]
-        normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+        normals = compute_face_normals(vertices, faces)
         return GeometryResult(vertices, faces, normals)
 
 
@@ -181,7 +210,7 @@ class CylinderGenerator:
             faces.append((b1, b2, t2))
             faces.append((b1, t2, t1))
 
-        normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+        normals = compute_face_normals(vertices, faces)
         return GeometryResult(vertices, faces, normals)
 
 
@@ -274,7 +303,7 @@ class ExtrudedPolylineGenerator:
         faces.append((e0, bottom_count + e0, bottom_count + e1))
         faces.append((e0, bottom_count + e1, e1))
 
-        normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+        normals = compute_face_normals(vertices, faces)
         return GeometryResult(vertices, faces, normals)
 
 
@@ -370,7 +399,7 @@ class DomeGenerator:
             v1 = (h + 1) % h_segments
             faces.append((base_center_idx, v1, v0))
 
-        normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+        normals = compute_face_normals(vertices, faces)
         return GeometryResult(vertices, faces, normals)
 
 
@@ -423,7 +452,7 @@ class FloorSlabGenerator:
             faces.append((b0, b1, t1))
             faces.append((b0, t1, t0))
 
-        normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+        normals = compute_face_normals(vertices, faces)
         return GeometryResult(vertices, faces, normals)
 
 
@@ -486,7 +515,7 @@ class RoofGenerator:
             faces.append((b0, b1, t1))
             faces.append((b0, t1, t0))
 
-        normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+        normals = compute_face_normals(vertices, faces)
         return GeometryResult(vertices, faces, normals)
 
 
@@ -641,7 +670,7 @@ class PipeSegmentGenerator:
             faces.append((b1, t1, t2))
             faces.append((b1, t2, b2))
 
-        normals = [compute_face_normal(vertices[f[0]], vertices[f[1]], vertices[f[2]]) for f in faces]
+        normals = compute_face_normals(vertices, faces)
         return GeometryResult(vertices, faces, normals)
 
 
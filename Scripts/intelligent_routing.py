@@ -67,6 +67,7 @@ class IntelligentRoutingEngine:
         print("Loading corridors...")
         detector = CorridorDetector(self.db_path)
         self.corridors = detector.detect_corridors()
+        detector.close()
         print(f"✅ Loaded {len(self.corridors)} corridors\n")
 
     def load_devices(self, discipline: str, device_type: str):